@@ -0,0 +1,131 @@
+"""Benchmark for chart rendering: pyplot per call vs pooled Figure/FigureCanvasAgg
+
+Renders every chart type with the previous pyplot-based approach (new figure
+through the global state machine on each call) and with
+pages/chart/chart_renderer.render_chart_png (pooled figures, no pyplot), then
+renders concurrently from worker threads to check thread safety. Finally
+renders line and scatter series from 1k to 10M points to show that
+downsampling keeps render time and PNG size flat, next to the same series
+rendered without downsampling up to RAW_SERIES_MAX points.
+
+Usage:
+    python benchmarks/bench_chart_render.py
+"""
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from pages.chart.chart_renderer import render_chart_png, CHART_SIZE, CHART_DPI
+
+RENDERS_PER_TYPE = 20
+THREADS = 4
+SERIES_SIZES = [1000, 100000, 1000000, 10000000]
+# Largest series also rendered without downsampling (slower ones take minutes)
+RAW_SERIES_MAX = 1000000
+
+CHARTS = {
+    'line': {'x': [1, 2, 3, 4, 5], 'y': [2, 4, 6, 8, 10], 'title': 'Line Chart'},
+    'bar': {'x': ['A', 'B', 'C', 'D', 'E'], 'y': [10, 20, 15, 25, 30], 'title': 'Bar Chart'},
+    'scatter': {'x': [1, 2, 3, 4, 5], 'y': [3, 1, 4, 1, 5], 'title': 'Scatter Plot'},
+    'pie': {'x': [], 'y': [30, 20, 25, 15, 10], 'title': 'Pie Chart'},
+}
+
+
+def render_with_pyplot(chart_type, data):
+    """Previous implementation: a new pyplot figure per call"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=CHART_SIZE)
+    if chart_type == 'line':
+        ax.plot(data['x'], data['y'], marker='o', linewidth=2, markersize=6)
+    elif chart_type == 'bar':
+        ax.bar(data['x'], data['y'])
+    elif chart_type == 'scatter':
+        ax.scatter(data['x'], data['y'], s=100, alpha=0.7)
+    elif chart_type == 'pie':
+        ax.pie(data['y'], labels=[f'Item {i+1}' for i in range(len(data['y']))])
+    ax.set_xlabel('X Axis')
+    ax.set_ylabel('Y Axis')
+    ax.set_title(data['title'])
+    if chart_type in ['line', 'bar']:
+        ax.grid(True, alpha=0.3)
+    plt.tight_layout()
+    img_buffer = io.BytesIO()
+    plt.savefig(img_buffer, format='png', dpi=CHART_DPI, bbox_inches='tight')
+    plt.close(fig)
+    return img_buffer.getvalue()
+
+
+def bench(render):
+    """Return mean milliseconds per chart for each chart type"""
+    results = {}
+    for chart_type, data in CHARTS.items():
+        # Warm up fonts, caches and the figure pool
+        render(chart_type, data)
+        start = time.perf_counter()
+        for _ in range(RENDERS_PER_TYPE):
+            render(chart_type, data)
+        results[chart_type] = (time.perf_counter() - start) / RENDERS_PER_TYPE * 1000
+    return results
+
+
+def bench_threaded():
+    """Render all chart types concurrently and return total seconds"""
+    jobs = [(chart_type, data) for chart_type, data in CHARTS.items()] * RENDERS_PER_TYPE
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        images = list(executor.map(lambda job: render_chart_png(*job), jobs))
+    elapsed = time.perf_counter() - start
+    assert all(image.startswith(b'\x89PNG') for image in images)
+    return elapsed, len(jobs)
+
+
+def render_series(chart_type, x, y, method):
+    """Render a series with the given downsampling method, return (ms, PNG bytes)"""
+    data = {'x': x, 'y': y, 'title': f'{len(y)} points', 'downsample': method}
+    start = time.perf_counter()
+    image = render_chart_png(chart_type, data)
+    return (time.perf_counter() - start) * 1000, len(image)
+
+
+def bench_series_sizes():
+    """Return (chart type, size, downsampled (ms, bytes), raw (ms, bytes) or None) per series"""
+    results = []
+    for size in SERIES_SIZES:
+        x = np.arange(size, dtype=float)
+        y = np.sin(x / (size / 20)) + np.random.default_rng(0).normal(0, 0.1, size)
+        for chart_type in ('line', 'scatter'):
+            downsampled = render_series(chart_type, x, y, 'auto')
+            raw = render_series(chart_type, x, y, 'none') if size <= RAW_SERIES_MAX else None
+            results.append((chart_type, size, downsampled, raw))
+    return results
+
+
+def main():
+    before = bench(render_with_pyplot)
+    after = bench(render_chart_png)
+
+    print(f'{"chart":>8} {"pyplot ms":>10} {"pooled ms":>10} {"speedup":>8}')
+    for chart_type in CHARTS:
+        print(f'{chart_type:>8} {before[chart_type]:>10.2f} {after[chart_type]:>10.2f} '
+              f'{before[chart_type] / after[chart_type]:>7.2f}x')
+
+    elapsed, count = bench_threaded()
+    print(f'\n{count} charts on {THREADS} threads: {elapsed * 1000:.0f} ms total, '
+          f'{elapsed / count * 1000:.2f} ms/chart')
+
+    print(f'\n{"chart":>8} {"points":>10} {"ms":>8} {"PNG KB":>8} {"raw ms":>9} {"raw KB":>8}')
+    for chart_type, size, (ms, png_bytes), raw in bench_series_sizes():
+        raw_columns = f'{raw[0]:>9.1f} {raw[1] / 1024:>8.1f}' if raw else f'{"-":>9} {"-":>8}'
+        print(f'{chart_type:>8} {size:>10} {ms:>8.1f} {png_bytes / 1024:>8.1f} {raw_columns}')
+
+
+if __name__ == '__main__':
+    main()
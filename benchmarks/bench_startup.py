@@ -0,0 +1,261 @@
+"""Startup benchmark: import times, page construction, first template and chart render
+
+Runs headless and prints machine-readable JSON. Each import is measured in a
+fresh interpreter with -X importtime, so results reflect a cold start.
+
+Usage:
+    python benchmarks/bench_startup.py                          # print results
+    python benchmarks/bench_startup.py --output results.json    # write results
+    python benchmarks/bench_startup.py --save-baseline          # store as baseline
+    python benchmarks/bench_startup.py --baseline               # compare, exit 1 on regression
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, 'benchmarks', 'startup_baseline.json')
+
+# Modules imported in a fresh interpreter, in startup order
+IMPORT_TARGETS = [
+    'nicegui',
+    'main',
+    'pages.home.home',
+    'pages.settings.settings',
+    'pages.chart.chart',
+    'pages.chart.chart_renderer',
+]
+
+# Page classes constructed in-process
+PAGE_CLASSES = [
+    ('pages.home.home', 'HomePage'),
+    ('pages.chart.chart', 'ChartPage'),
+    ('pages.settings.settings', 'SettingsPage'),
+]
+
+# Slowest modules (by self time) reported per import target
+TOP_MODULES = 10
+
+# A metric regresses when it is this much slower than baseline...
+REGRESSION_RATIO = 1.2
+# ...and at least this many milliseconds slower (ignores noise on tiny metrics)
+REGRESSION_MIN_MS = 5.0
+
+
+def measure_import(module_name):
+    """Import a module in a fresh interpreter with -X importtime
+
+    Returns wall time, cumulative import time and the slowest modules by
+    self time, parsed from the importtime report.
+    """
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    modules = []
+    cumulative_ms = None
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        modules.append((name, int(self_us) / 1000, int(cumulative_us) / 1000))
+        if name.strip() == module_name:
+            cumulative_ms = int(cumulative_us) / 1000
+
+    result = {'wall_ms': round(wall_ms, 2)}
+    if process.returncode != 0:
+        result['error'] = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else 'import failed'
+        return result
+
+    result['cumulative_ms'] = cumulative_ms
+    result['top_modules'] = [
+        {'module': name.strip(), 'self_ms': self_ms, 'cumulative_ms': cumulative}
+        for name, self_ms, cumulative in sorted(modules, key=lambda m: m[1], reverse=True)[:TOP_MODULES]
+    ]
+    return result
+
+
+def timed(func):
+    """Run func and return (milliseconds, result or error string)"""
+    start = time.perf_counter()
+    try:
+        value = func()
+        error = None
+    except Exception as e:
+        value = None
+        error = f'{type(e).__name__}: {e}'
+    return (time.perf_counter() - start) * 1000, value, error
+
+
+def measure_pages():
+    """Time page-object construction"""
+    import importlib
+    results = {}
+    for module_name, class_name in PAGE_CLASSES:
+        def construct():
+            module = importlib.import_module(module_name)
+            return getattr(module, class_name)()
+        elapsed, _, error = timed(construct)
+        results[class_name] = {'ms': round(elapsed, 2)} if error is None else {'error': error}
+    return results
+
+
+def measure_template_renders():
+    """Time first (cold) and second (warm) render of every page template"""
+    from utils.page_template_engine import PageTemplateEngine
+    from utils.page_data_loader import PageDataLoader
+    from utils.page_registry import get_registered_pages
+
+    engine = PageTemplateEngine()
+    data_loader = PageDataLoader()
+    results = {}
+    for page in get_registered_pages():
+        name = page['name']
+        template_path = os.path.join(PROJECT_ROOT, 'pages', name, f'{name}_template.html')
+
+        def render():
+            with open(template_path, 'r', encoding='utf-8') as f:
+                template = f.read()
+            return engine.render_string(template, data_loader.load_page_data(name) or {})
+
+        first_ms, _, error = timed(render)
+        if error:
+            results[name] = {'error': error}
+            continue
+        warm_ms, _, _ = timed(render)
+        results[name] = {'first_ms': round(first_ms, 3), 'warm_ms': round(warm_ms, 3)}
+    return results
+
+
+def measure_chart_render():
+    """Time first (cold matplotlib) and warm chart render"""
+    def render():
+        from pages.chart.chart_jobs import render_chart_job
+        return render_chart_job('line', None)
+
+    first_ms, _, error = timed(render)
+    if error:
+        return {'error': error}
+    warm_ms, _, _ = timed(render)
+    return {'first_ms': round(first_ms, 2), 'warm_ms': round(warm_ms, 2)}
+
+
+def measure_main_build():
+    """Time main.main() building the UI for one client (without starting the server)
+
+    main() is a @ui.page function, so it runs inside a client context the
+    way NiceGUI builds a page for a new browser tab.
+    """
+    import asyncio
+    from nicegui import Client
+    from nicegui.page import page
+
+    async def build_page():
+        import main
+        client = Client(page(''), request=None)
+        try:
+            with client:
+                await main.main()
+        finally:
+            client.delete()
+
+    elapsed, _, error = timed(lambda: asyncio.run(build_page()))
+    return {'ms': round(elapsed, 2)} if error is None else {'error': error}
+
+
+def run_benchmarks():
+    """Run every measurement and return the JSON-serializable results"""
+    os.chdir(PROJECT_ROOT)
+    sys.path.insert(0, PROJECT_ROOT)
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'imports': {module_name: measure_import(module_name) for module_name in IMPORT_TARGETS},
+        'pages': measure_pages(),
+        'templates': measure_template_renders(),
+        'chart': measure_chart_render(),
+        'main': measure_main_build(),
+    }
+
+
+def flatten_metrics(results):
+    """Flatten results to {metric name: milliseconds} for comparison"""
+    metrics = {}
+    for module_name, result in results.get('imports', {}).items():
+        if result.get('cumulative_ms') is not None:
+            metrics[f'import.{module_name}'] = result['cumulative_ms']
+    for class_name, result in results.get('pages', {}).items():
+        if 'ms' in result:
+            metrics[f'construct.{class_name}'] = result['ms']
+    for page_name, result in results.get('templates', {}).items():
+        if 'first_ms' in result:
+            metrics[f'template.{page_name}.first'] = result['first_ms']
+    if 'first_ms' in results.get('chart', {}):
+        metrics['chart.first'] = results['chart']['first_ms']
+    if 'ms' in results.get('main', {}):
+        metrics['main.build'] = results['main']['ms']
+    return metrics
+
+
+def compare_with_baseline(results, baseline):
+    """Return a list of regressions against a baseline result"""
+    current = flatten_metrics(results)
+    previous = flatten_metrics(baseline)
+    regressions = []
+    for metric, value in sorted(current.items()):
+        base = previous.get(metric)
+        if base is None:
+            continue
+        if value > base * REGRESSION_RATIO and value - base > REGRESSION_MIN_MS:
+            regressions.append({'metric': metric, 'baseline_ms': base, 'current_ms': value,
+                                'ratio': round(value / base, 2) if base else None})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Startup and import-time benchmark')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    parser.add_argument('--baseline', nargs='?', const=DEFAULT_BASELINE,
+                        help='Compare with a baseline JSON file (exit 1 on regression)')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE,
+                        help='Store the results as the new baseline')
+    args = parser.parse_args()
+
+    if args.baseline and not os.path.exists(args.baseline):
+        parser.error(f'no baseline at {args.baseline} - record one with --save-baseline first')
+
+    results = run_benchmarks()
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            results['regressions'] = compare_with_baseline(results, json.load(f))
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            f.write(output)
+
+    if results.get('regressions'):
+        for regression in results['regressions']:
+            print(f"REGRESSION {regression['metric']}: {regression['baseline_ms']:.1f} ms -> "
+                  f"{regression['current_ms']:.1f} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark for {% for %} loop rendering in PageTemplateEngine
+
+Renders a features-style loop over growing item counts with a large page
+context and reports the time per item. Linear scaling shows up as a flat
+per-item time across sizes.
+
+Usage:
+    python benchmarks/bench_template_loops.py
+"""
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.page_template_engine import PageTemplateEngine
+
+LOOP_TEMPLATE = '''
+<div class="feature-cards">
+    {% for feature in features %}
+    <div class="feature-card">
+        <div class="feature-title">{{feature.icon}} {{feature.title}}</div>
+        <div class="feature-description">{{feature.description}}</div>
+        <button class="btn" onclick="window.parent.postMessage({type: '{{feature.action}}'}, '*')">
+            Open {{feature.title}}
+        </button>
+    </div>
+    {% endfor %}
+</div>
+'''
+
+ITEM_COUNTS = [100, 1000, 10000, 100000]
+CONTEXT_SIZE = 200
+REPEAT = 3
+
+
+def make_variables(item_count):
+    """Build page data with item_count features and a large surrounding context"""
+    variables = {f'extra_{i}': f'value {i}' for i in range(CONTEXT_SIZE)}
+    variables['features'] = [
+        {
+            'icon': '📊',
+            'title': f'Feature {i}',
+            'description': f'Description of feature {i}.',
+            'action': f'action_{i}'
+        }
+        for i in range(item_count)
+    ]
+    return variables
+
+
+def bench(engine, item_count):
+    """Return the best render time in seconds for item_count items"""
+    variables = make_variables(item_count)
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        engine.render_string(LOOP_TEMPLATE, variables)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    engine = PageTemplateEngine()
+    # Compile once so that only rendering is measured
+    engine.compile_string(LOOP_TEMPLATE)
+    
+    print(f'{"items":>8} {"total ms":>10} {"us/item":>10}')
+    for item_count in ITEM_COUNTS:
+        elapsed = bench(engine, item_count)
+        print(f'{item_count:>8} {elapsed * 1000:>10.2f} {elapsed / item_count * 1e6:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
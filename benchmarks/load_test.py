@@ -0,0 +1,488 @@
+"""Multi-client load test: N simulated browsers navigating pages and generating charts
+
+Starts the app headless (MYAPP_NATIVE=0) on a local port, or targets a running
+server with --url, then drives simulated clients over NiceGUI's socket.io
+connection, the same way nicegui.js does in a browser: load the page, read the
+element tree and socket query from it, perform the handshake with a document
+id, send element events with the listener ids of the rendered elements, answer
+run_javascript requests and acknowledge received messages. Each scenario
+reports p50/p95/p99 latency per action, throughput and server RSS (sampled
+while the scenario runs).
+
+Scenarios:
+    navigate  click through every other menu entry (switch_page / BasePage.create_page)
+    chart     open the chart page and generate charts with random data (update_chart)
+    mixed     both, interleaved
+
+Latency is measured from sending an event to receiving the server's response:
+the next element update for navigation, and the update containing the new
+/charts/ image URL for charts.
+
+Requires httpx and python-socketio[asyncio_client], both installed with nicegui.
+
+Usage:
+    python benchmarks/load_test.py                                  # 20 clients, all scenarios
+    python benchmarks/load_test.py --clients 200 --iterations 5     # 200 concurrent users
+    python benchmarks/load_test.py --scenarios chart --output load.json
+    python benchmarks/load_test.py --url http://localhost:8080      # running server
+"""
+import os
+import re
+import ast
+import sys
+import json
+import math
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+from urllib.parse import urlencode
+
+import httpx
+import socketio
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SOCKET_PATH = '/_nicegui_ws/socket.io'
+SCENARIOS = ('navigate', 'chart', 'mixed')
+
+# Seconds to wait for the server to respond to one action
+ACTION_TIMEOUT = 60.0
+# Seconds between server RSS samples
+RSS_INTERVAL = 0.2
+# Clients connecting at the same time (keeps the ramp-up from measuring accept queues)
+CONNECT_CONCURRENCY = 20
+# Seconds between acknowledgements of received messages (as nicegui.js does)
+ACK_INTERVAL = 3.0
+
+# The page embeds its element tree as createApp(parseElements(String.raw`...`), {query: {...}, ...})
+_ELEMENTS_PATTERN = re.compile(r'parseElements\(String\.raw`(.*?)`\)', re.DOTALL)
+_QUERY_PATTERN = re.compile(r'^\s*query:\s*(\{.*?\}),\s*$', re.MULTILINE)
+# Entities nicegui escapes inside the String.raw literal (undone in this order by parseElements)
+_ELEMENT_ENTITIES = (('&#36;', '$'), ('&#96;', '`'), ('&gt;', '>'), ('&lt;', '<'), ('&amp;', '&'))
+
+
+def percentile(values, fraction):
+    """Return the nearest-rank percentile of values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(latencies_ms):
+    """Return count and p50/p95/p99/mean/max of a list of milliseconds"""
+    if not latencies_ms:
+        return {'count': 0}
+    return {
+        'count': len(latencies_ms),
+        'p50_ms': round(percentile(latencies_ms, 0.50), 2),
+        'p95_ms': round(percentile(latencies_ms, 0.95), 2),
+        'p99_ms': round(percentile(latencies_ms, 0.99), 2),
+        'mean_ms': round(sum(latencies_ms) / len(latencies_ms), 2),
+        'max_ms': round(max(latencies_ms), 2),
+    }
+
+
+def read_rss_bytes(pid):
+    """Resident memory of a process and its children (render workers), or None"""
+    try:
+        import psutil
+        process = psutil.Process(pid)
+        return sum(p.memory_info().rss for p in [process] + process.children(recursive=True))
+    except ImportError:
+        pass
+    except Exception:
+        return None
+
+    # Linux without psutil: main process only
+    try:
+        with open(f'/proc/{pid}/status', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+class RssSampler:
+    """Sample server RSS in the background while a scenario runs"""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.samples = []
+        self._task = None
+
+    async def _run(self):
+        while True:
+            rss = read_rss_bytes(self.pid)
+            if rss is not None:
+                self.samples.append(rss)
+            await asyncio.sleep(RSS_INTERVAL)
+
+    def start(self):
+        if self.pid is not None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if not self.samples:
+            return None
+        return {
+            'start_mb': round(self.samples[0] / 1024 / 1024, 1),
+            'end_mb': round(self.samples[-1] / 1024 / 1024, 1),
+            'peak_mb': round(max(self.samples) / 1024 / 1024, 1),
+        }
+
+
+def parse_elements(html):
+    """Extract the initial element tree (id -> element dict) from the page HTML"""
+    match = _ELEMENTS_PATTERN.search(html)
+    if match is None:
+        raise RuntimeError('element tree not found in page HTML')
+    raw = match.group(1)
+    for entity, character in _ELEMENT_ENTITIES:
+        raw = raw.replace(entity, character)
+    return json.loads(raw)
+
+
+def parse_socket_query(html):
+    """Extract the socket.io query parameters (client_id, next_message_id) from the page HTML"""
+    match = _QUERY_PATTERN.search(html)
+    if match is None:
+        raise RuntimeError('socket query not found in page HTML')
+    # Rendered as a Python dict literal
+    return ast.literal_eval(match.group(1))
+
+
+class SimulatedClient:
+    """One browser: page load, socket.io handshake and element events"""
+
+    def __init__(self, base_url, http):
+        self.base_url = base_url
+        self.http = http
+        self.client_id = None
+        self.next_message_id = 0
+        self.acked_message_id = -1
+        self.current_page = None
+        self.elements = {}
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self._waiters = []
+        self._ack_task = None
+        self.sio.on('*', self._on_message)
+
+    async def _on_message(self, event, data=None):
+        """Track element updates, answer JavaScript requests and wake waiting actions"""
+        if isinstance(data, dict) and isinstance(data.get('_id'), int):
+            # Messages are numbered; a reconnect may replay ones already seen
+            if data['_id'] < self.next_message_id:
+                return
+            self.next_message_id = data['_id'] + 1
+
+        if event == 'update' and isinstance(data, dict):
+            for element_id, element in data.items():
+                if element_id.startswith('_'):
+                    continue
+                if element is None:
+                    self.elements.pop(element_id, None)
+                else:
+                    self.elements[element_id] = element
+        elif event == 'run_javascript' and isinstance(data, dict) and data.get('request_id'):
+            # No JavaScript runs here; answer like a script returning nothing so awaiting handlers continue
+            await self.sio.emit('javascript_response', {
+                'request_id': data['request_id'], 'client_id': self.client_id, 'result': None})
+
+        text = None
+        for waiter in list(self._waiters):
+            predicate, future = waiter
+            if future.done():
+                continue
+            if predicate is not None:
+                if text is None:
+                    text = json.dumps(data, default=str)
+                if not predicate(event, text):
+                    continue
+            future.set_result(event)
+            self._waiters.remove(waiter)
+
+    async def _ack_loop(self):
+        """Acknowledge received messages so the server can drop them from its history"""
+        while True:
+            await asyncio.sleep(ACK_INTERVAL)
+            if self.acked_message_id < self.next_message_id:
+                await self.sio.emit('ack', {'client_id': self.client_id, 'next_message_id': self.next_message_id})
+                self.acked_message_id = self.next_message_id
+
+    async def connect(self):
+        """Load the page, open its socket.io connection and perform the handshake"""
+        response = await self.http.get(self.base_url + '/')
+        response.raise_for_status()
+        self.elements = parse_elements(response.text)
+        query = parse_socket_query(response.text)
+        self.client_id = query['client_id']
+        self.next_message_id = query.get('next_message_id', 0)
+
+        await self.sio.connect(
+            f'{self.base_url}?{urlencode(query)}',
+            socketio_path=SOCKET_PATH, transports=['websocket'],
+            headers={'Referer': self.base_url + '/'}
+        )
+        accepted = await self.sio.call('handshake', {
+            'client_id': self.client_id,
+            'document_id': str(uuid.uuid4()),
+            'tab_id': str(uuid.uuid4()),
+            'old_tab_id': None,
+            'next_message_id': self.next_message_id,
+        }, timeout=ACTION_TIMEOUT)
+        if not accepted:
+            raise RuntimeError(f'handshake rejected for client {self.client_id}')
+        self._ack_task = asyncio.create_task(self._ack_loop())
+
+    async def disconnect(self):
+        if self._ack_task is not None:
+            self._ack_task.cancel()
+        await self.sio.disconnect()
+
+    def find_element(self, text, tag=None):
+        """Return the id of the element whose text or label contains text"""
+        for element_id, element in self.elements.items():
+            if tag is not None and tag != element.get('tag'):
+                continue
+            props = element.get('props') or {}
+            candidates = (element.get('text'), props.get('label'), props.get('innerHTML'))
+            if any(isinstance(value, str) and text in value for value in candidates):
+                return element_id
+        raise LookupError(f'element not found: {text}')
+
+    async def send_event(self, element_id, event_type, args=None):
+        """Send an element event like nicegui.js does (listener id from the rendered element, args JSON-encoded)"""
+        element = self.elements[element_id]
+        for listener in element.get('events', []):
+            if listener.get('type') == event_type:
+                await self.sio.emit('event', {
+                    'id': int(element_id),
+                    'client_id': self.client_id,
+                    'listener_id': listener['listener_id'],
+                    'args': [json.dumps(arg) for arg in (args or [])],
+                })
+                return
+        raise LookupError(f'element {element_id} ({element.get("tag")}) has no {event_type} listener')
+
+    async def timed_event(self, element_id, event_type, args=None, predicate=None):
+        """Send an event and return milliseconds until the matching server message"""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((predicate, future))
+        start = time.perf_counter()
+        await self.send_event(element_id, event_type, args)
+        await asyncio.wait_for(future, ACTION_TIMEOUT)
+        return (time.perf_counter() - start) * 1000
+
+    async def set_value(self, label, value):
+        """Type a value into an input (no response is awaited)"""
+        await self.send_event(self.find_element(label, tag='nicegui-input'), 'update:value', [value])
+
+    async def open_page(self, page_name, label):
+        """Click a menu entry and return milliseconds until the page is shown (None if it already is)"""
+        if page_name == self.current_page:
+            return None
+        latency = await self.timed_event(self.find_element(label, tag='q-btn'), 'click',
+                                         predicate=lambda event, text: event == 'update')
+        self.current_page = page_name
+        return latency
+
+
+def load_manifest():
+    """Menu labels in manifest order and the page shown first"""
+    with open(os.path.join(PROJECT_ROOT, 'pages', 'manifest.json'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    labels = {entry['name']: entry.get('label', entry['name'].title()) for entry in manifest.get('pages', [])}
+    return labels, manifest.get('default_page') or next(iter(labels), None)
+
+
+async def navigate(client, labels, record):
+    """Click through every other menu entry"""
+    for page_name, label in labels.items():
+        latency = await client.open_page(page_name, label)
+        if latency is not None:
+            record('navigate', latency)
+
+
+async def generate_chart(client, labels, record):
+    """Open the chart page and generate a chart with random data"""
+    if 'chart' in labels:
+        await client.open_page('chart', labels['chart'])
+    size = random.randint(5, 50)
+    await client.set_value('X Values', ','.join(str(i) for i in range(1, size + 1)))
+    await client.set_value('Y Values', ','.join(str(random.randint(1, 100)) for _ in range(size)))
+    await client.set_value('Chart Title', f'Load test {uuid.uuid4().hex[:8]}')
+    latency = await client.timed_event(
+        client.find_element('Generate Chart', tag='q-btn'), 'click',
+        predicate=lambda event, text: '/charts/' in text)
+    record('chart', latency)
+
+
+async def run_client(base_url, http, scenario, iterations, labels, default_page, record, errors, connect_gate):
+    """Connect one client and run a scenario iterations times"""
+    client = SimulatedClient(base_url, http)
+    try:
+        async with connect_gate:
+            start = time.perf_counter()
+            await client.connect()
+            record('connect', (time.perf_counter() - start) * 1000)
+        client.current_page = default_page
+
+        for iteration in range(iterations):
+            if scenario == 'navigate' or (scenario == 'mixed' and iteration % 2 == 0):
+                await navigate(client, labels, record)
+            else:
+                await generate_chart(client, labels, record)
+    except Exception as e:
+        errors.append(f'{type(e).__name__}: {e}')
+    finally:
+        try:
+            await client.disconnect()
+        except Exception:
+            pass
+
+
+async def run_scenario(base_url, scenario, clients, iterations, server_pid):
+    """Run one scenario with all clients at once and return its report"""
+    labels, default_page = load_manifest()
+    latencies = {}
+    errors = []
+
+    def record(action, latency_ms):
+        latencies.setdefault(action, []).append(latency_ms)
+
+    sampler = RssSampler(server_pid)
+    sampler.start()
+    connect_gate = asyncio.Semaphore(CONNECT_CONCURRENCY)
+    limits = httpx.Limits(max_connections=CONNECT_CONCURRENCY * 2)
+    start = time.perf_counter()
+    async with httpx.AsyncClient(timeout=ACTION_TIMEOUT, limits=limits) as http:
+        await asyncio.gather(*[
+            run_client(base_url, http, scenario, iterations, labels, default_page, record, errors, connect_gate)
+            for _ in range(clients)
+        ])
+    elapsed = time.perf_counter() - start
+    rss = await sampler.stop()
+
+    actions = sum(len(values) for action, values in latencies.items() if action != 'connect')
+    return {
+        'clients': clients,
+        'iterations': iterations,
+        'seconds': round(elapsed, 2),
+        'throughput_per_s': round(actions / elapsed, 2) if elapsed else None,
+        'latency': {action: summarize(values) for action, values in sorted(latencies.items())},
+        'errors': len(errors),
+        'error_samples': sorted(set(errors))[:5],
+        'rss': rss,
+    }
+
+
+def _read_log(log_file):
+    """Tail of the server's stderr log"""
+    log_file.seek(0)
+    return log_file.read().decode(errors='replace')[-2000:]
+
+
+def start_server(port, warmup):
+    """Start the app headless on port and wait until it serves pages
+
+    Server stderr goes to a temporary file, not a pipe: an unread pipe
+    fills up and blocks a chatty server mid-run. The file is returned
+    with the process and read when the server fails.
+    """
+    env = dict(os.environ, MYAPP_NATIVE='0', MYAPP_RELOAD='0', MYAPP_PORT=str(port),
+               MYAPP_WARMUP='1' if warmup else '0')
+    log_file = tempfile.TemporaryFile()
+    process = subprocess.Popen([sys.executable, 'main.py'], cwd=PROJECT_ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=log_file)
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            message = _read_log(log_file)
+            log_file.close()
+            raise RuntimeError(f'server exited: {message}')
+        try:
+            if httpx.get(base_url + '/', timeout=2).status_code == 200:
+                return process, base_url, log_file
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    message = _read_log(log_file)
+    log_file.close()
+    raise RuntimeError(f'server did not start within 60 s: {message}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Multi-client load test')
+    parser.add_argument('--clients', type=int, default=20, help='Concurrent simulated clients')
+    parser.add_argument('--iterations', type=int, default=3, help='Scenario repetitions per client')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f'Comma separated scenarios ({", ".join(SCENARIOS)})')
+    parser.add_argument('--url', help='Target a running server instead of starting one')
+    parser.add_argument('--port', type=int, default=8765, help='Port for the started server')
+    parser.add_argument('--warmup', action='store_true', help='Enable the background warm-up on the started server')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for chart data')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f'unknown scenarios: {", ".join(unknown)}')
+    random.seed(args.seed)
+
+    process = None
+    log_file = None
+    if args.url:
+        base_url, server_pid = args.url.rstrip('/'), None
+    else:
+        process, base_url, log_file = start_server(args.port, args.warmup)
+        server_pid = process.pid
+
+    try:
+        results = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'url': base_url,
+            'scenarios': {},
+        }
+        for scenario in scenarios:
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(f'server exited during the run: {_read_log(log_file)}')
+            results['scenarios'][scenario] = asyncio.run(
+                run_scenario(base_url, scenario, args.clients, args.iterations, server_pid))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+            log_file.close()
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if any(report['errors'] for report in results['scenarios'].values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
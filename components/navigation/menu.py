@@ -1,20 +1,23 @@
 from nicegui import ui
+from utils.page_registry import get_registered_pages
 
-def create_menu(switch_page_callback):
+def create_menu(switch_page_callback, pages=None):
     """Create the left sidebar menu
     
     Args:
         switch_page_callback: Function to call when switching pages
+        pages: Page entries with 'name' and 'label' (defaults to the page registry)
     """
+    if pages is None:
+        pages = get_registered_pages()
+    
     with ui.left_drawer().classes('bg-blue-50'):
         ui.label('Menu').classes('text-h6 q-pa-md')
         ui.separator()
         
-        # Home button
-        home_btn = ui.button('🏠 Home', on_click=lambda: switch_page_callback('home')).classes('full-width q-ma-sm')
-        
-        # Chart button
-        chart_btn = ui.button('📊 Charts', on_click=lambda: switch_page_callback('chart')).classes('full-width q-ma-sm')
-        
-        # Settings button
-        settings_btn = ui.button('⚙️ Settings', on_click=lambda: switch_page_callback('settings')).classes('full-width q-ma-sm') 
\ No newline at end of file
+        # One button per registered page
+        for page in pages:
+            ui.button(
+                page['label'],
+                on_click=lambda name=page['name']: switch_page_callback(name)
+            ).classes('full-width q-ma-sm')
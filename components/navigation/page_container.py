@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from nicegui import ui
+
+# Class marking a hidden kept page
+INACTIVE_PAGE_CLASS = 'myapp-inactive-page'
+
+# Switches off <style>/<link> elements added to hidden pages later (e.g. when a
+# template refresh replaces the page content); installed once per browser tab
+_INACTIVE_STYLE_OBSERVER = (
+    'window.myappInactiveStyleObserver = window.myappInactiveStyleObserver || (() => {'
+    'const selector = "style, link[rel=stylesheet]";'
+    'const observer = new MutationObserver(mutations => {'
+    'for (const mutation of mutations) for (const node of mutation.addedNodes) {'
+    f'if (node.nodeType !== 1 || !node.closest(".{INACTIVE_PAGE_CLASS}")) continue;'
+    'if (node.matches(selector)) node.media = "not all";'
+    'node.querySelectorAll(selector).forEach(s => s.media = "not all");'
+    '}'
+    '});'
+    'observer.observe(document.body, {childList: true, subtree: true});'
+    'return observer;'
+    '})();'
+)
+
+
+class KeepAlivePageContainer:
+    """Main content area that keeps built pages alive between navigations
+
+    Each page is built once into its own column. Switching pages only hides
+    the current column and shows the target one; the least recently visited
+    pages are deleted once more than max_pages are alive. With
+    keep_alive=False every switch clears the content area and rebuilds the
+    page, as before.
+    """
+
+    def __init__(self, parent, max_pages: int = 3, keep_alive: bool = True):
+        self.parent = parent
+        self.max_pages = max(1, max_pages)
+        self.keep_alive = keep_alive
+        self.pages = OrderedDict()
+        self.current_page = None
+
+    def show(self, page_name: str, create_page):
+        """Show page_name, building it with create_page() if it is not alive"""
+        if not self.keep_alive:
+            self.parent.clear()
+            with self.parent:
+                create_page()
+            self.current_page = page_name
+            return
+
+        if page_name == self.current_page and page_name in self.pages:
+            return
+
+        # Hide the current page
+        if self.current_page in self.pages:
+            self._set_page_active(self.current_page, False)
+
+        if page_name in self.pages:
+            self.pages.move_to_end(page_name)
+            self._set_page_active(page_name, True)
+        else:
+            with self.parent:
+                with ui.column().classes('full-width') as page_column:
+                    create_page()
+            self.pages[page_name] = page_column
+            self._evict()
+
+        self.current_page = page_name
+
+    def remove(self, page_name: str):
+        """Delete a kept page so it is rebuilt on next visit"""
+        page_column = self.pages.pop(page_name, None)
+        if page_column is not None:
+            page_column.delete()
+        if self.current_page == page_name:
+            self.current_page = None
+
+    def clear(self):
+        """Delete all kept pages"""
+        for page_name in list(self.pages):
+            self.remove(page_name)
+
+    def _set_page_active(self, page_name: str, active: bool):
+        """Show or hide a kept page
+
+        Hidden pages keep their template <style> blocks and stylesheet links
+        in the DOM, so these are switched off while hidden to stop them
+        styling the visible page. Hidden pages are marked with a class, so
+        styles a later refresh adds to them are switched off as well.
+        """
+        page_column = self.pages[page_name]
+        page_column.set_visibility(active)
+        if active:
+            page_column.classes(remove=INACTIVE_PAGE_CLASS)
+        else:
+            page_column.classes(add=INACTIVE_PAGE_CLASS)
+        media = 'all' if active else 'not all'
+        ui.run_javascript(
+            _INACTIVE_STYLE_OBSERVER +
+            f'document.querySelectorAll("#c{page_column.id} style, #c{page_column.id} link[rel=stylesheet]")'
+            f'.forEach(s => s.media = "{media}");'
+        )
+
+    def _evict(self):
+        """Delete least recently visited pages beyond max_pages"""
+        while len(self.pages) > self.max_pages:
+            page_name = next(iter(self.pages))
+            self.remove(page_name)
@@ -1,32 +1,41 @@
+import os
 from nicegui import ui, app
-from pages.home.home import create_home_page
-from pages.settings.settings import create_settings_page
-from pages.chart.chart import create_chart_page
 from components.navigation.menu import create_menu
+from components.navigation.page_container import KeepAlivePageContainer
+from utils.page_registry import get_page_factory, get_default_page
+from utils.warmup import start_warmup, get_warmup_progress
+from utils.client_session import get_client_session
+from utils.page_data_loader import load_page_data_async
+from utils.page_data_writer import flush_page_data_writes
+from utils.payload_metrics import install_payload_metrics, track_payload
+from utils.invocation_profiler import profile_invocation
+# Register the chart image, script bundle, stylesheet and diagnostics routes at startup (page modules are imported lazily)
+import utils.chart_image_server
+import utils.script_bundle_server
+import utils.stylesheet_server
+import utils.diagnostics_server
 
-# Global variable to manage current page
-current_page_container = None
-
-def switch_page(page_name):
-    """Switch between pages"""
-    global current_page_container
-    
-    # Clear current page container
-    if current_page_container:
-        current_page_container.clear()
-    
-    # Create new page (executed within container)
-    with current_page_container:
-        if page_name == 'home':
-            create_home_page()
-        elif page_name == 'settings':
-            create_settings_page()
-        elif page_name == 'chart':
-            create_chart_page()
+async def switch_page(page_name):
+    """Switch between pages for the current client"""
+    # Page modules are imported on first navigation (see pages/manifest.json)
+    create_page = get_page_factory(page_name)
+    if create_page is None:
+        return
+    
+    # Profiled when profiling mode is on (MYAPP_PROFILE=1 or the Settings page)
+    async with profile_invocation('page_switch'):
+        # Count the websocket bytes this navigation sends (see the Diagnostics page)
+        with track_payload('page_switch'):
+            # Read page data off the event loop so the page builds from the cache
+            await load_page_data_async(page_name)
+            
+            # Show the kept page, or build it on first visit
+            get_client_session().page_container.show(page_name, create_page)
 
-def main():
-    """Main application"""
-    global current_page_container
+@ui.page('/')
+async def main():
+    """Main application (built once per client)"""
+    session = get_client_session()
     
     # Set app title
     ui.page_title('My Application')
@@ -38,24 +47,55 @@ def main():
     # Create left menu
     create_menu(switch_page)
     
-    # Main content area
+    # Main content area (pages are kept alive and switched by visibility)
     with ui.column().classes('full-width q-pa-md') as content_container:
-        current_page_container = content_container
-        # Display home page by default
-        with current_page_container:
-            create_home_page()
+        session.page_container = KeepAlivePageContainer(
+            content_container,
+            max_pages=int(os.environ.get('MYAPP_KEEP_ALIVE_PAGES', '3')),
+            keep_alive=os.environ.get('MYAPP_KEEP_ALIVE', '1') != '0'
+        )
+        # Display default page
+        await switch_page(get_default_page())
     
     # Create footer
     with ui.footer().classes('bg-grey-100'):
         ui.label('© 2024 My Application').classes('text-caption')
+        create_warmup_status()
+
+def create_warmup_status():
+    """Show background warm-up progress in the footer until it finishes"""
+    if not get_warmup_progress()['enabled']:
+        return
+    
+    status_label = ui.label().classes('text-caption text-grey-7 q-ml-md')
+    
+    def update_status():
+        progress = get_warmup_progress()
+        if progress['done']:
+            status_label.set_visibility(False)
+            status_timer.deactivate()
+        elif progress['started']:
+            status_label.text = f"Warming up {progress['completed']}/{progress['total']}..."
+    
+    status_timer = ui.timer(0.5, update_status)
 
 if __name__ in {"__main__", "__mp_main__"}:
-    main()
+    # Warm caches in the background once the window has connected (MYAPP_WARMUP=0 disables)
+    app.on_connect(start_warmup)
+    # Write page data still waiting in the write-behind queue
+    app.on_shutdown(flush_page_data_writes)
+    # Measure websocket messages per client and action (MYAPP_PAYLOAD_METRICS=1 enables)
+    install_payload_metrics()
+    # Serve a shared dashboard in the browser with MYAPP_NATIVE=0 MYAPP_HOST=0.0.0.0
+    native = os.environ.get('MYAPP_NATIVE', '1') != '0'
     ui.run(
         title='My Application',
-        port=8080,
-        reload=True,
-        show=True,
-        native=True,
-        window_size=(1400, 900)  # Default window size (width, height)
-    ) 
\ No newline at end of file
+        host=os.environ.get('MYAPP_HOST', '127.0.0.1'),
+        port=int(os.environ.get('MYAPP_PORT', '8080')),
+        # Templates, page data and scripts are refreshed by utils.file_watcher,
+        # so the process-restarting reload watcher can be turned off (MYAPP_RELOAD=0)
+        reload=os.environ.get('MYAPP_RELOAD', '1') != '0',
+        show=native,
+        native=native,
+        window_size=(1400, 900) if native else None  # Default window size (width, height)
+    )
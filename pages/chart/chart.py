@@ -1,17 +1,21 @@
 import sys
 import os
-import matplotlib.pyplot as plt
-import matplotlib
-import io
-import base64
+import asyncio
 from nicegui import ui
 
 # Add utils directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from utils.page_base import BasePage
-from utils.page_template_loader import load_template
-from utils.page_script_loader import load_script
-from utils.page_data_loader import load_page_data
+from utils.render_executor import run_render_job, run_idle_render_job, get_render_queue_stats, RenderQueueFullError
+from utils.chart_image_cache import make_chart_key, get_cached_chart_async, put_cached_chart_async
+from utils.chart_image_server import get_chart_url
+from utils.payload_metrics import track_payload
+from utils.stage_timing import stage_span, timed_stage
+from utils.invocation_profiler import profile_invocation
+from pages.chart.chart_data_sources import get_source_signature
+from pages.chart.chart_jobs import (
+    render_chart_job, parse_chart_input, CHART_SIZE, CHART_DPI, DEFAULT_CHART_DATA
+)
 
 
 class ChartPage(BasePage):
@@ -29,53 +33,36 @@ class ChartPage(BasePage):
     
     def __init__(self):
         super().__init__('chart')
-        # Set matplotlib to use non-interactive backend
-        matplotlib.use('Agg')
     
+    @timed_stage('create_matplotlib_chart', page='chart')
     def create_matplotlib_chart(self, chart_type='line', data=None):
         """Create a matplotlib chart and return as base64 encoded image"""
-        if data is None:
-            data = {
-                'x': [1, 2, 3, 4, 5],
-                'y': [2, 4, 6, 8, 10],
-                'title': 'Sample Chart',
-                'xlabel': 'X Axis',
-                'ylabel': 'Y Axis'
-            }
-        
-        # Create figure and axis
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Create chart based on type
-        if chart_type == 'line':
-            ax.plot(data['x'], data['y'], marker='o', linewidth=2, markersize=6)
-        elif chart_type == 'bar':
-            ax.bar(data['x'], data['y'])
-        elif chart_type == 'scatter':
-            ax.scatter(data['x'], data['y'], s=100, alpha=0.7)
-        elif chart_type == 'pie':
-            ax.pie(data['y'], labels=data.get('labels', [f'Item {i+1}' for i in range(len(data['y']))]))
-        
-        # Set labels and title
-        ax.set_xlabel(data.get('xlabel', 'X Axis'))
-        ax.set_ylabel(data.get('ylabel', 'Y Axis'))
-        ax.set_title(data.get('title', 'Chart'))
-        
-        # Add grid for line and bar charts
-        if chart_type in ['line', 'bar']:
-            ax.grid(True, alpha=0.3)
+        # Imported on first use so matplotlib is not loaded with the page
+        from pages.chart.chart_renderer import create_matplotlib_chart
+        return create_matplotlib_chart(chart_type, data)
+    
+    async def render_chart(self, chart_type='line', data=None, background=False):
+        """Render a chart off the event loop and return the URL serving the image
         
-        # Adjust layout
-        plt.tight_layout()
+        Identical charts are served from the chart image cache. Background
+        renders (warm-up) wait until no other render job runs or waits.
+        """
+        if data is None:
+            data = DEFAULT_CHART_DATA
         
-        # Convert to base64
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-        plt.close()
+        with stage_span('chart_cache_lookup', page='chart'):
+            cache_key = make_chart_key(chart_type, data, CHART_SIZE[0], CHART_SIZE[1], CHART_DPI)
+            image = await get_cached_chart_async(cache_key)
+        if image is None:
+            # Includes the wait for a free render worker
+            with stage_span('chart_render', page='chart'):
+                if background:
+                    image = await run_idle_render_job(render_chart_job, chart_type, data)
+                else:
+                    image = await run_render_job(render_chart_job, chart_type, data)
+            await put_cached_chart_async(cache_key, image)
         
-        return img_base64
+        return get_chart_url(cache_key)
     
     def create_chart_section(self):
         """Create interactive chart section"""
@@ -89,52 +76,70 @@ class ChartPage(BasePage):
                 label='Chart Type'
             ).classes('q-mb-md')
             
+            # Data source selector
+            data_source = ui.select(
+                options={'manual': 'Manual input', 'file': 'Data file (.npy / .csv)'},
+                value='manual',
+                label='Data Source'
+            ).classes('q-mb-md')
+            
             # Data input section
-            with ui.row().classes('q-mb-md'):
+            with ui.row().classes('q-mb-md').bind_visibility_from(data_source, 'value', value='manual'):
                 x_data = ui.input('X Values (comma separated)', value='1,2,3,4,5').classes('q-mr-sm')
                 y_data = ui.input('Y Values (comma separated)', value='2,4,6,8,10').classes('q-mr-sm')
             
+            # Data file section (memory-mapped, for large series)
+            file_path = ui.input(
+                'Data File Path',
+                placeholder='Enter .npy or .csv path in the data directory (e.g., sensor.npy)'
+            ).classes('q-mb-md full-width').bind_visibility_from(data_source, 'value', value='file')
+            
             chart_title = ui.input('Chart Title', value='Sample Chart').classes('q-mb-md')
             
             # Chart display area
             chart_container = ui.html('').classes('q-mt-md')
             
-            def update_chart():
+            async def update_chart():
+                # Profiled when profiling mode is on (MYAPP_PROFILE=1 or the Settings page)
+                async with profile_invocation('chart_render'):
+                    # Count the websocket bytes this chart render sends (see the Diagnostics page)
+                    with track_payload('chart_render'), stage_span('update_chart', page='chart'):
+                        await show_chart()
+            
+            async def show_chart():
                 try:
-                    # Parse input data
-                    x_values = []
-                    y_values = []
+                    if data_source.value == 'file':
+                        # The render worker memory-maps the file itself;
+                        # the file signature keeps cached images fresh
+                        data = {
+                            'source': file_path.value,
+                            'source_signature': get_source_signature(file_path.value or ''),
+                            'title': chart_title.value,
+                            'xlabel': 'X Axis',
+                            'ylabel': 'Y Axis'
+                        }
+                    else:
+                        # Parse input data
+                        data = parse_chart_input(chart_type.value, x_data.value, y_data.value, chart_title.value)
                     
-                    if x_data.value.strip():
-                        x_values = [x.strip() for x in x_data.value.split(',')]
-                        # Try to convert to numbers for numeric charts
-                        if chart_type.value != 'bar':
-                            x_values = [float(x) for x in x_values]
-                    
-                    if y_data.value.strip():
-                        y_values = [float(y.strip()) for y in y_data.value.split(',')]
-                    
-                    data = {
-                        'x': x_values,
-                        'y': y_values,
-                        'title': chart_title.value,
-                        'xlabel': 'X Axis',
-                        'ylabel': 'Y Axis'
-                    }
-                    
-                    # Generate chart
-                    img_base64 = self.create_matplotlib_chart(chart_type.value, data)
+                    # Generate chart in the render pool so the event loop stays responsive
+                    chart_url = await self.render_chart(chart_type.value, data)
                     
                     # Update display
                     chart_container.content = f'''
                     <div style="text-align: center; padding: 20px;">
-                        <img src="data:image/png;base64,{img_base64}" 
+                        <img src="{chart_url}" 
                              style="max-width: 100%; height: auto; border: 1px solid #ddd; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
                     </div>
                     '''
                     
                     ui.notify('Chart generated successfully!', type='positive')
                     
+                except RenderQueueFullError:
+                    stats = get_render_queue_stats()
+                    ui.notify(f'Chart server is busy ({stats["queued"]} charts waiting), please try again', type='warning')
+                except asyncio.TimeoutError:
+                    ui.notify('Chart generation timed out', type='negative')
                 except Exception as e:
                     ui.notify(f'Error creating chart: {str(e)}', type='negative')
             
@@ -145,6 +150,7 @@ class ChartPage(BasePage):
             
             def reset_form():
                 chart_type.value = 'line'
+                data_source.value = 'manual'
                 x_data.value = '1,2,3,4,5'
                 y_data.value = '2,4,6,8,10'
                 chart_title.value = 'Sample Chart'
@@ -154,12 +160,13 @@ class ChartPage(BasePage):
             # Quick chart buttons
             ui.label('🚀 Quick Charts:').classes('text-subtitle2 q-mb-sm')
             
-            def create_quick_chart(chart_type_val, x_vals, y_vals, title):
+            async def create_quick_chart(chart_type_val, x_vals, y_vals, title):
                 chart_type.value = chart_type_val
+                data_source.value = 'manual'
                 x_data.value = x_vals
                 y_data.value = y_vals
                 chart_title.value = title
-                update_chart()
+                await update_chart()
             
             with ui.row().classes('q-mb-sm'):
                 ui.button('Line', on_click=lambda: create_quick_chart('line', '1,2,3,4,5', '2,4,6,8,10', 'Line Chart')).classes('q-mr-sm q-mb-sm')
@@ -168,51 +175,17 @@ class ChartPage(BasePage):
                 ui.button('Pie', on_click=lambda: create_quick_chart('pie', '', '30,20,25,15,10', 'Pie Chart')).classes('q-mr-sm q-mb-sm')
                 ui.button('Random', on_click=lambda: create_random_chart()).classes('q-mr-sm q-mb-sm')
             
-            def create_random_chart():
+            async def create_random_chart():
                 import random
                 x_vals = ','.join([str(i) for i in range(1, 11)])
                 y_vals = ','.join([str(random.randint(1, 50)) for _ in range(10)])
-                create_quick_chart('line', x_vals, y_vals, 'Random Data Chart')
+                await create_quick_chart('line', x_vals, y_vals, 'Random Data Chart')
 
 
-    def create_page(self, template_filename: str = None, handler_script: str = None, 
-                   show_script_loader: bool = False, show_json_loader: bool = False):
-        """Create page using HTML template as foundation (Angular-like approach)"""
-        
-        # Load page data from JSON file
-        page_data = load_page_data(self.page_name)
-        
-        # Set default template filename if not provided
-        if template_filename is None:
-            template_filename = f'{self.page_name}_template.html'
-        
-        # Set default handler script if not provided
-        if handler_script is None:
-            handler_script = f'pages/{self.page_name}/{self.page_name}_handler.js'
-        
-        # Load handler script first
-        load_script(handler_script)
-        
-        # Load and render the page using HTML template from file
-        template_path = os.path.join(self.page_dir, template_filename)
-        html_container = load_template(template_path, page_data)
-        
-        if html_container:
-            # Add chart generation section after HTML template
+    def create_sections(self):
+        """Add the chart generation section after HTML template"""
+        with stage_span('create_chart_section'):
             self.create_chart_section()
-            
-            # Add optional sections
-            if show_script_loader:
-                self.create_script_loader_section()
-            
-            if show_json_loader:
-                self.create_json_loader_section()
-            
-            return html_container
-        else:
-            # Show message if template loading failed
-            ui.label(f'{self.page_name.title()} page could not be loaded.').classes('text-h6 q-mb-md text-center text-red')
-            return None
 
 
 # Create instance and function for backward compatibility
@@ -0,0 +1,192 @@
+import os
+import hashlib
+import numpy as np
+
+# Project root (pages/chart/ -> project root)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Converted CSV files are cached here as .npy so later loads are memory-mapped
+SERIES_CACHE_DIR = os.environ.get('MYAPP_SERIES_CACHE_DIR', os.path.join(_PROJECT_ROOT, '.chart_cache', 'series'))
+
+# Bytes of converted series kept on disk (least recently used are deleted beyond this)
+MAX_SERIES_CACHE_BYTES = int(os.environ.get('MYAPP_SERIES_CACHE_BYTES', str(2 * 1024 * 1024 * 1024)))
+
+# Directory that data files must be inside; '*' allows any path on the server
+CHART_DATA_DIR = os.environ.get('MYAPP_CHART_DATA_DIR', os.path.join(_PROJECT_ROOT, 'data'))
+
+# Value of MYAPP_CHART_DATA_DIR that lifts the restriction
+UNRESTRICTED_DATA_DIR = '*'
+
+# Bytes of CSV text parsed per chunk (bounds memory while converting)
+CSV_CHUNK_BYTES = 16 * 1024 * 1024
+
+SUPPORTED_EXTENSIONS = ('.npy', '.csv')
+
+
+class DataSourceError(Exception):
+    """Raised when a chart data file cannot be used"""
+
+
+def resolve_series_path(file_path):
+    """Return the absolute path of a data file after validating it"""
+    file_path = file_path.strip()
+    if CHART_DATA_DIR == UNRESTRICTED_DATA_DIR:
+        abs_path = os.path.realpath(os.path.expanduser(file_path))
+    else:
+        # Relative paths are relative to the data directory
+        data_dir = os.path.realpath(CHART_DATA_DIR)
+        abs_path = os.path.realpath(os.path.join(data_dir, file_path))
+        if os.path.commonpath([abs_path, data_dir]) != data_dir:
+            raise DataSourceError(f"Data file must be inside {data_dir}")
+    if not abs_path.lower().endswith(SUPPORTED_EXTENSIONS):
+        raise DataSourceError(f"Unsupported data file (expected .npy or .csv): {file_path}")
+    if not os.path.isfile(abs_path):
+        raise DataSourceError(f"Data file not found: {file_path}")
+    return abs_path
+
+
+def get_source_signature(file_path):
+    """Return (mtime_ns, size) of a data file, used in the chart cache key"""
+    stat = os.stat(resolve_series_path(file_path))
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def load_series(file_path):
+    """Load (x, y) arrays from a .npy or .csv file without building Python lists
+
+    Both file types end up as read-only memory maps, so multi-GB files are
+    paged in on demand instead of being read into memory. x is None when the
+    file only holds y values (x is the point index).
+    """
+    abs_path = resolve_series_path(file_path)
+    if abs_path.lower().endswith('.csv'):
+        abs_path = _convert_csv(abs_path)
+
+    array = np.load(abs_path, mmap_mode='r', allow_pickle=False)
+    return _split_columns(array, file_path)
+
+
+def _split_columns(array, file_path):
+    """Interpret an array as y, (n, 2) x/y columns, or (2, n) x/y rows"""
+    if array.ndim == 1:
+        return None, array
+    if array.ndim == 2 and array.shape[1] >= 2:
+        return array[:, 0], array[:, 1]
+    if array.ndim == 2 and array.shape[0] == 2:
+        return array[0], array[1]
+    if array.ndim == 2 and array.shape[1] == 1:
+        return None, array[:, 0]
+    raise DataSourceError(f"Unsupported array shape {array.shape} in {file_path}")
+
+
+def _convert_csv(abs_path):
+    """Convert a CSV file to a cached .npy file and return its path
+
+    The CSV is parsed in chunks with NumPy's C reader and streamed to disk,
+    so memory use is bounded by the chunk size. The cache entry is keyed by
+    path, size and mtime and reused until the CSV changes. Every row must
+    have as many columns as the first one.
+    """
+    stat = os.stat(abs_path)
+    cache_key = hashlib.sha1(f'{abs_path}:{stat.st_size}:{stat.st_mtime_ns}'.encode('utf-8')).hexdigest()
+    npy_path = os.path.join(SERIES_CACHE_DIR, f'{cache_key}.npy')
+    if os.path.exists(npy_path):
+        # Mark as recently used for eviction
+        try:
+            os.utime(npy_path)
+        except OSError:
+            pass
+        return npy_path
+
+    os.makedirs(SERIES_CACHE_DIR, exist_ok=True)
+    raw_path = f'{npy_path}.{os.getpid()}.raw'
+    temp_path = f'{npy_path}.{os.getpid()}.tmp'
+    rows = 0
+    width = None
+    columns = None
+    try:
+        with open(abs_path, 'r', encoding='utf-8') as source, open(raw_path, 'wb') as raw:
+            first_chunk = True
+            while True:
+                lines = source.readlines(CSV_CHUNK_BYTES)
+                if not lines:
+                    break
+                if first_chunk:
+                    lines = _skip_header(lines)
+                    first_chunk = False
+                lines = [line for line in lines if line.strip()]
+                if not lines:
+                    continue
+
+                chunk = np.loadtxt(lines, delimiter=',', dtype=np.float64, ndmin=2)
+                if width is None:
+                    width = chunk.shape[1]
+                    columns = min(width, 2)
+                elif chunk.shape[1] != width:
+                    raise ValueError(f"data row {rows + 1} has {chunk.shape[1]} columns, "
+                                     f"expected {width} as in the first row")
+                chunk = np.ascontiguousarray(chunk[:, :columns])
+                raw.write(chunk.tobytes())
+                rows += chunk.shape[0]
+
+        if columns is None:
+            raise DataSourceError(f"No numeric data in {abs_path}")
+
+        # Prepend the .npy header to the raw rows and publish atomically
+        shape = (rows,) if columns == 1 else (rows, columns)
+        with open(temp_path, 'wb') as target, open(raw_path, 'rb') as raw:
+            np.lib.format.write_array_header_1_0(
+                target, {'descr': np.lib.format.dtype_to_descr(np.dtype(np.float64)),
+                         'fortran_order': False, 'shape': shape})
+            while True:
+                block = raw.read(64 * 1024 * 1024)
+                if not block:
+                    break
+                target.write(block)
+        os.replace(temp_path, npy_path)
+        _evict_series_cache(npy_path)
+    except ValueError as e:
+        raise DataSourceError(f"Invalid CSV data in {abs_path}: {e}")
+    finally:
+        for path in (raw_path, temp_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    return npy_path
+
+
+def _evict_series_cache(keep_path):
+    """Delete least recently used converted series until the cache fits its byte limit
+
+    keep_path (the file just converted) is never deleted. Series still
+    memory-mapped by a render stay readable until it finishes.
+    """
+    files = []
+    for entry in os.scandir(SERIES_CACHE_DIR):
+        if entry.name.endswith('.npy') and entry.path != keep_path:
+            stat = entry.stat()
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+    files.sort()
+
+    total = os.path.getsize(keep_path) + sum(size for _, size, _ in files)
+    for _, size, path in files:
+        if total <= MAX_SERIES_CACHE_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def _skip_header(lines):
+    """Drop a leading header line that is not numeric"""
+    for index, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            [float(value) for value in line.split(',')]
+            return lines[index:]
+        except ValueError:
+            return lines[index + 1:]
+    return []
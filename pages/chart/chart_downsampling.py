@@ -0,0 +1,161 @@
+import numpy as np
+
+# Downsample only when a series has this many times more points than the target
+DOWNSAMPLE_THRESHOLD = 2
+
+# Slices a pie is combined into at most (more are unreadable, and labels dominate render time)
+MAX_PIE_SLICES = 100
+
+# Elements read per block, so memory-mapped series are never loaded whole
+BLOCK_ELEMENTS = 4 * 1024 * 1024
+
+
+def _as_numeric(values):
+    """Return values as a numeric array, without copying ndarrays or memory maps"""
+    if isinstance(values, np.ndarray) and np.issubdtype(values.dtype, np.number):
+        return values
+    return np.asarray(values, dtype=float)
+
+
+def _take(x, indices):
+    """Pick x values at indices (x=None means the index itself)"""
+    if x is None:
+        return indices.astype(float)
+    return np.asarray(x[indices], dtype=float)
+
+
+def minmax_downsample(x, y, n_buckets):
+    """Keep the minimum and maximum point of each bucket (at most 2 * n_buckets points)
+
+    Preserves peaks and troughs, which is what a line at pixel resolution shows.
+    y is read block by block, so memory use does not grow with the series.
+    """
+    n = len(y)
+    if n_buckets < 1 or n <= 2 * n_buckets:
+        return x, y
+
+    bucket_size = -(-n // n_buckets)
+    buckets_per_block = max(1, BLOCK_ELEMENTS // bucket_size)
+    selected = [np.array([0, n - 1])]
+
+    for first_bucket in range(0, n_buckets, buckets_per_block):
+        start = first_bucket * bucket_size
+        if start >= n:
+            break
+        end = min(n, start + buckets_per_block * bucket_size)
+        block = np.asarray(y[start:end], dtype=float)
+
+        # Pad the last bucket by repeating the final value
+        bucket_count = -(-len(block) // bucket_size)
+        padding = bucket_count * bucket_size - len(block)
+        if padding:
+            block = np.concatenate((block, np.repeat(block[-1], padding)))
+        buckets = block.reshape(bucket_count, bucket_size)
+        offsets = start + np.arange(bucket_count) * bucket_size
+
+        selected.append(np.minimum(offsets + np.argmin(buckets, axis=1), n - 1))
+        selected.append(np.minimum(offsets + np.argmax(buckets, axis=1), n - 1))
+
+    # Keep both extremes in their original order, plus the first and last points
+    indices = np.unique(np.concatenate(selected))
+    return _take(x, indices), np.asarray(y[indices], dtype=float)
+
+
+def lttb_downsample(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling to n_out points
+
+    Picks the point in each bucket that forms the largest triangle with the
+    previously selected point and the average of the next bucket, which keeps
+    the visual shape of the series.
+    """
+    n = len(y)
+    if n_out < 3 or n <= n_out:
+        return x, y
+
+    # Bucket edges between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    edges[-1] = n - 1
+    bucket_counts = np.maximum(np.diff(edges), 1)
+
+    # Average of every bucket, computed once; the final "bucket" is the last point
+    bucket_sums_y = np.add.reduceat(y[:n - 1], edges[:-1], dtype=float)
+    avg_y = np.append(bucket_sums_y / bucket_counts, y[n - 1])
+    if x is None:
+        avg_x = np.append((edges[:-1] + edges[1:] - 1) / 2, n - 1)
+    else:
+        bucket_sums_x = np.add.reduceat(x[:n - 1], edges[:-1], dtype=float)
+        avg_x = np.append(bucket_sums_x / bucket_counts, x[n - 1])
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        bucket_x = np.arange(start, end, dtype=float) if x is None else np.asarray(x[start:end], dtype=float)
+        bucket_y = np.asarray(y[start:end], dtype=float)
+        x_a = float(a) if x is None else float(x[a])
+        y_a = float(y[a])
+        area = np.abs((x_a - avg_x[i + 1]) * (bucket_y - y_a) - (x_a - bucket_x) * (avg_y[i + 1] - y_a))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return _take(x, selected), np.asarray(y[selected], dtype=float)
+
+
+def bucket_downsample(x, y, n_buckets, reduce='mean'):
+    """Combine consecutive points into n_buckets bars or slices
+
+    Each bucket becomes one point at the average x of the bucket with the
+    mean (bars) or sum (pie slices, so proportions are kept) of its values.
+    """
+    n = len(y)
+    if n_buckets < 1 or n <= n_buckets:
+        return x, y
+
+    starts = (np.arange(n_buckets) * n) // n_buckets
+    counts = np.diff(np.append(starts, n))
+    sums = np.add.reduceat(y, starts, dtype=float)
+    values = sums if reduce == 'sum' else sums / counts
+    if x is None:
+        centers = starts + (counts - 1) / 2
+    else:
+        centers = np.add.reduceat(x, starts, dtype=float) / counts
+    return centers, values
+
+
+def downsample_series(chart_type, x, y, width_px, method='auto'):
+    """Reduce a series to roughly the chart's pixel width
+
+    For line and scatter charts method is 'auto' (min/max for lines, LTTB
+    for scatter), 'minmax', 'lttb' or 'none'. Bar and pie series are
+    combined into width_px bars or MAX_PIE_SLICES slices unless method is
+    'none'. x=None means
+    the point index. Series that are not numeric or have mismatched lengths
+    are returned unchanged.
+    """
+    if method == 'none' or chart_type not in ('line', 'scatter', 'bar', 'pie'):
+        return x, y
+
+    try:
+        x_array = None if x is None else _as_numeric(x)
+        y_array = _as_numeric(y)
+    except (TypeError, ValueError):
+        return x, y
+
+    if y_array.ndim != 1 or (x_array is not None and x_array.shape != y_array.shape):
+        return x, y
+    if chart_type == 'pie':
+        width_px = min(width_px, MAX_PIE_SLICES)
+    if len(y_array) <= DOWNSAMPLE_THRESHOLD * width_px:
+        return x_array, y_array
+
+    if chart_type in ('bar', 'pie'):
+        return bucket_downsample(x_array, y_array, width_px, 'sum' if chart_type == 'pie' else 'mean')
+
+    if method == 'auto':
+        method = 'minmax' if chart_type == 'line' else 'lttb'
+
+    if method == 'minmax':
+        return minmax_downsample(x_array, y_array, width_px)
+    return lttb_downsample(x_array, y_array, width_px)
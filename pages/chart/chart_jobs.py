@@ -0,0 +1,48 @@
+"""Lightweight chart rendering entry points
+
+Keeps matplotlib out of the web process: the chart page only needs the
+output settings and a picklable job function, and the renderer (with
+matplotlib) is imported by whichever worker runs the first job.
+"""
+
+# Output size of every chart (part of the chart cache key)
+CHART_SIZE = (10, 6)
+CHART_DPI = 100
+CHART_WIDTH_PX = int(CHART_SIZE[0] * CHART_DPI)
+
+DEFAULT_CHART_DATA = {
+    'x': [1, 2, 3, 4, 5],
+    'y': [2, 4, 6, 8, 10],
+    'title': 'Sample Chart',
+    'xlabel': 'X Axis',
+    'ylabel': 'Y Axis'
+}
+
+
+def parse_chart_input(chart_type, x_text, y_text, title):
+    """Build chart data from the comma separated form inputs"""
+    x_values = []
+    y_values = []
+
+    if x_text.strip():
+        x_values = [x.strip() for x in x_text.split(',')]
+        # Try to convert to numbers for numeric charts
+        if chart_type != 'bar':
+            x_values = [float(x) for x in x_values]
+
+    if y_text.strip():
+        y_values = [float(y.strip()) for y in y_text.split(',')]
+
+    return {
+        'x': x_values,
+        'y': y_values,
+        'title': title,
+        'xlabel': 'X Axis',
+        'ylabel': 'Y Axis'
+    }
+
+
+def render_chart_job(chart_type='line', data=None):
+    """Render a chart to PNG bytes, importing the renderer on first use"""
+    from pages.chart.chart_renderer import render_chart_png
+    return render_chart_png(chart_type, data)
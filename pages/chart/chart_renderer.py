@@ -0,0 +1,129 @@
+import io
+import base64
+import threading
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+from pages.chart.chart_downsampling import downsample_series
+from pages.chart.chart_data_sources import load_series
+from pages.chart.chart_jobs import CHART_SIZE, CHART_DPI, CHART_WIDTH_PX, DEFAULT_CHART_DATA
+
+# Line charts draw point markers only up to this many points
+MAX_MARKER_POINTS = 100
+
+# Figures kept per chart type for reuse
+FIGURE_POOL_SIZE = 4
+
+
+class FigurePool:
+    """Pool of reusable Agg figures per chart type
+
+    Uses Figure and FigureCanvasAgg directly instead of the global pyplot
+    state, so each thread renders on its own figure. A figure is taken out of
+    the pool for the duration of one render, then cleared and returned.
+    """
+
+    def __init__(self, max_per_type: int = FIGURE_POOL_SIZE):
+        self.max_per_type = max_per_type
+        self.figures = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, chart_type: str):
+        """Get a (figure, axes) pair for chart_type"""
+        with self._lock:
+            pooled = self.figures.get(chart_type)
+            if pooled:
+                return pooled.pop()
+
+        fig = Figure(figsize=CHART_SIZE, dpi=CHART_DPI)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        return fig, ax
+
+    def release(self, chart_type: str, fig, ax):
+        """Clear a figure and return it to the pool"""
+        ax.clear()
+        with self._lock:
+            pooled = self.figures.setdefault(chart_type, [])
+            if len(pooled) < self.max_per_type:
+                pooled.append((fig, ax))
+
+    def clear(self):
+        """Drop all pooled figures"""
+        with self._lock:
+            self.figures.clear()
+
+# Global instance (one per process)
+figure_pool = FigurePool()
+
+
+def create_matplotlib_chart(chart_type='line', data=None):
+    """Create a matplotlib chart and return as base64 encoded image"""
+    return base64.b64encode(render_chart_png(chart_type, data)).decode()
+
+
+def _bar_width(x):
+    """Bar width in x units: matplotlib's 0.8 of the spacing of numeric x (bucketed series are spaced wider)"""
+    if isinstance(x, np.ndarray) and np.issubdtype(x.dtype, np.number) and len(x) > 1:
+        spacing = np.diff(x)
+        spacing = spacing[spacing > 0]
+        if len(spacing):
+            return 0.8 * float(spacing.min())
+    return 0.8
+
+
+def render_chart_png(chart_type='line', data=None):
+    """Render a matplotlib chart and return the PNG bytes
+
+    Module-level so it can be pickled and run in a worker process, and
+    thread-safe so it can run in a worker thread.
+    """
+    if data is None:
+        data = DEFAULT_CHART_DATA
+
+    # Series come from the request or are memory-mapped from a data file
+    if data.get('source'):
+        x, y = load_series(data['source'])
+    else:
+        x, y = data['x'], data['y']
+
+    # Reduce huge series to about one point (or bar/slice) per pixel
+    x, y = downsample_series(chart_type, x, y, CHART_WIDTH_PX, data.get('downsample', 'auto'))
+    if x is None:
+        x = np.arange(len(y))
+
+    fig, ax = figure_pool.acquire(chart_type)
+    try:
+        # Create chart based on type
+        if chart_type == 'line':
+            marker = 'o' if len(x) <= MAX_MARKER_POINTS else None
+            ax.plot(x, y, marker=marker, linewidth=2, markersize=6)
+        elif chart_type == 'bar':
+            ax.bar(x, y, width=_bar_width(x))
+        elif chart_type == 'scatter':
+            ax.scatter(x, y, s=100, alpha=0.7)
+        elif chart_type == 'pie':
+            labels = data.get('labels')
+            # Labels of a series that was combined into fewer slices no longer apply
+            if labels is None or len(labels) != len(y):
+                labels = [f'Item {i+1}' for i in range(len(y))]
+            ax.pie(y, labels=labels)
+
+        # Set labels and title
+        ax.set_xlabel(data.get('xlabel', 'X Axis'))
+        ax.set_ylabel(data.get('ylabel', 'Y Axis'))
+        ax.set_title(data.get('title', 'Chart'))
+
+        # Add grid for line and bar charts
+        if chart_type in ['line', 'bar']:
+            ax.grid(True, alpha=0.3)
+
+        # Adjust layout
+        fig.tight_layout()
+
+        # Convert to PNG
+        img_buffer = io.BytesIO()
+        fig.savefig(img_buffer, format='png', dpi=CHART_DPI, bbox_inches='tight')
+        return img_buffer.getvalue()
+    finally:
+        figure_pool.release(chart_type, fig, ax)
@@ -0,0 +1,152 @@
+import sys
+import os
+from nicegui import ui
+
+# Add utils directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from utils.page_base import BasePage
+from utils.payload_metrics import get_payload_stats, reset_payload_stats, track_payload
+
+
+def format_bytes(size) -> str:
+    """Format a byte count for display (1536 -> '1.5 KB')"""
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024 or unit == 'MB':
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+
+
+def format_histogram(histogram: dict) -> str:
+    """Show the non-empty buckets of a cumulative histogram ('≤4 KB: 3 · ≤16 KB: 1')"""
+    parts = []
+    previous = 0
+    for bucket in histogram['buckets']:
+        count = bucket['count'] - previous
+        previous = bucket['count']
+        if count:
+            bound = bucket['le']
+            label = f'>{format_bytes(histogram["buckets"][-2]["le"])}' if bound == '+Inf' else f'≤{format_bytes(bound)}'
+            parts.append(f'{label}: {count}')
+    return ' · '.join(parts)
+
+
+class DiagnosticsPage(BasePage):
+    """Diagnostics page showing what the application sends to browsers"""
+
+    # Page configuration constants
+    PAGE_CONFIG = {
+        'page_scripts': [],
+        'page_data': [
+            ('Diagnostics Data', 'pages/diagnostics/diagnostics_data.json')
+        ]
+    }
+
+    PAYLOAD_ACTION_COLUMNS = [
+        {'name': 'action', 'label': 'Action', 'field': 'action', 'align': 'left'},
+        {'name': 'invocations', 'label': 'Count', 'field': 'invocations'},
+        {'name': 'messages', 'label': 'Messages', 'field': 'messages'},
+        {'name': 'bytes', 'label': 'Total', 'field': 'bytes'},
+        {'name': 'average', 'label': 'Avg / action', 'field': 'average'},
+        {'name': 'max', 'label': 'Max / action', 'field': 'max'},
+        {'name': 'distribution', 'label': 'Bytes per action', 'field': 'distribution', 'align': 'left'},
+        {'name': 'types', 'label': 'By message type', 'field': 'types', 'align': 'left'}
+    ]
+
+    PAYLOAD_CLIENT_COLUMNS = [
+        {'name': 'client', 'label': 'Client', 'field': 'client', 'align': 'left'},
+        {'name': 'messages', 'label': 'Messages', 'field': 'messages'},
+        {'name': 'bytes', 'label': 'Total', 'field': 'bytes'},
+        {'name': 'actions', 'label': 'By action', 'field': 'actions', 'align': 'left'}
+    ]
+
+    def __init__(self):
+        super().__init__('diagnostics')
+
+    def get_payload_rows(self):
+        """Table rows of the websocket payload statistics (heaviest first)"""
+        stats = get_payload_stats()
+
+        action_rows = []
+        for action, action_stats in stats['actions'].items():
+            action_bytes = action_stats['action_bytes']
+            types = sorted(action_stats['message_types'].items(), key=lambda item: -item[1]['bytes'])
+            action_rows.append({
+                'action': action,
+                'invocations': action_stats['invocations'],
+                'messages': action_stats['messages'],
+                'total': action_stats['bytes'],
+                'bytes': format_bytes(action_stats['bytes']),
+                'average': format_bytes(action_bytes['sum'] / action_bytes['count']) if action_bytes['count'] else '-',
+                'max': format_bytes(action_bytes['max']),
+                'distribution': format_histogram(action_bytes),
+                'types': ', '.join(f"{name} {format_bytes(totals['bytes'])}" for name, totals in types)
+            })
+        action_rows.sort(key=lambda row: -row['total'])
+
+        client_rows = []
+        for client_id, actions in stats['clients'].items():
+            client_rows.append({
+                'client': client_id,
+                'messages': sum(totals['messages'] for totals in actions.values()),
+                'total': sum(totals['bytes'] for totals in actions.values()),
+                'actions': ', '.join(f"{action} {format_bytes(totals['bytes'])}" for action, totals in actions.items())
+            })
+        client_rows.sort(key=lambda row: -row['total'])
+        for row in client_rows:
+            row['bytes'] = format_bytes(row['total'])
+
+        return action_rows, client_rows
+
+    def create_payload_section(self):
+        """Create the websocket payload statistics section"""
+        with ui.card().classes('q-ma-md full-width'):
+            ui.label('📡 Websocket Payloads').classes('text-h6')
+            status = ui.label().classes('text-caption text-grey-7 q-mb-md')
+
+            ui.label('Per action').classes('text-subtitle2')
+            action_table = ui.table(columns=self.PAYLOAD_ACTION_COLUMNS, rows=[], row_key='action').classes('full-width q-mb-md')
+
+            ui.label('Per client').classes('text-subtitle2')
+            client_table = ui.table(columns=self.PAYLOAD_CLIENT_COLUMNS, rows=[], row_key='client').classes('full-width q-mb-md')
+
+            def show_stats():
+                stats = get_payload_stats()
+                if not stats['enabled']:
+                    status.text = 'Payload metrics are disabled (start with MYAPP_PAYLOAD_METRICS=1)'
+                else:
+                    status.text = (f"Messages sent within {stats['attribution_window']:.2f}s "
+                                   f"after an action count towards it")
+                action_rows, client_rows = self.get_payload_rows()
+                action_table.rows[:] = action_rows
+                client_table.rows[:] = client_rows
+                action_table.update()
+                client_table.update()
+
+            def refresh():
+                # The refresh itself is traffic too - keep it apart from the measured actions
+                with track_payload('diagnostics'):
+                    show_stats()
+
+            def reset():
+                reset_payload_stats()
+                refresh()
+                ui.notify('Payload statistics reset')
+
+            with ui.row():
+                ui.button('🔄 Refresh', on_click=refresh).classes('q-mr-sm')
+                ui.button('🗑️ Reset', on_click=reset).classes('q-mr-sm')
+
+            # Built inside the page switch, which is measured as such
+            show_stats()
+
+    def create_sections(self):
+        """Add the diagnostics sections after HTML template"""
+        self.create_payload_section()
+
+
+# Create instance and function for backward compatibility
+diagnostics_page = DiagnosticsPage()
+
+def create_diagnostics_page():
+    """Create diagnostics page using HTML template as foundation (Angular-like approach)"""
+    return diagnostics_page.create_page()
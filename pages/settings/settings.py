@@ -1,9 +1,13 @@
 import sys
 import os
+from nicegui import ui
 
 # Add utils directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from utils.page_base import BasePage
+from utils.invocation_profiler import (
+    set_profiling, is_profiling_enabled, get_profile_results, get_profiler_stats
+)
 
 
 class SettingsPage(BasePage):
@@ -19,8 +23,91 @@ class SettingsPage(BasePage):
         ]
     }
     
+    PROFILE_FUNCTION_COLUMNS = [
+        {'name': 'function', 'label': 'Function', 'field': 'function', 'align': 'left'},
+        {'name': 'cumulative', 'label': 'Cumulative ms', 'field': 'cumulative', 'sortable': True},
+        {'name': 'own', 'label': 'Own ms', 'field': 'own', 'sortable': True},
+        {'name': 'calls', 'label': 'Calls', 'field': 'calls', 'sortable': True}
+    ]
+    
+    PROFILE_ALLOCATION_COLUMNS = [
+        {'name': 'location', 'label': 'Allocated at', 'field': 'location', 'align': 'left'},
+        {'name': 'size', 'label': 'Size +KB', 'field': 'size', 'sortable': True},
+        {'name': 'blocks', 'label': 'Blocks +', 'field': 'blocks', 'sortable': True}
+    ]
+    
     def __init__(self):
         super().__init__('settings')
+    
+    def create_profiling_section(self):
+        """Create the profiling mode section (toggle and summaries of recent profiles)"""
+        with ui.card().classes('q-ma-md full-width'):
+            ui.label('🔬 Profiling').classes('text-h6')
+            ui.label(
+                'Profiles page switches and chart renders with cProfile and tracemalloc. '
+                'Slows the application down while on - turn it off when done.'
+            ).classes('text-caption text-grey-7 q-mb-sm')
+            
+            status = ui.label().classes('text-caption q-mb-sm')
+            profile_select = ui.select(options={}, label='Profiled invocation').classes('q-mb-md full-width')
+            
+            ui.label('Top functions (cumulative time)').classes('text-subtitle2')
+            function_table = ui.table(columns=self.PROFILE_FUNCTION_COLUMNS, rows=[], row_key='function').classes('full-width q-mb-md')
+            
+            ui.label('Top allocations (memory growth)').classes('text-subtitle2')
+            allocation_table = ui.table(columns=self.PROFILE_ALLOCATION_COLUMNS, rows=[], row_key='location').classes('full-width q-mb-md')
+            
+            results = []
+            
+            def show_result():
+                result = results[profile_select.value] if profile_select.value is not None else None
+                function_table.rows[:] = [
+                    {
+                        'function': entry['function'],
+                        'cumulative': round(entry['cumulative_time'] * 1000, 2),
+                        'own': round(entry['total_time'] * 1000, 2),
+                        'calls': entry['calls']
+                    }
+                    for entry in (result['functions'] if result else [])
+                ]
+                allocation_table.rows[:] = [
+                    {
+                        'location': entry['location'],
+                        'size': round(entry['size_diff'] / 1024, 1),
+                        'blocks': entry['count_diff']
+                    }
+                    for entry in (result['allocations'] if result else [])
+                ]
+                function_table.update()
+                allocation_table.update()
+            
+            def refresh():
+                stats = get_profiler_stats()
+                status.text = (f"{'On' if stats['enabled'] else 'Off'} - {stats['profiled']} profiled, "
+                               f"{stats['skipped']} skipped; the last {stats['max_profiles']} are kept in "
+                               f"{stats['profile_dir']}")
+                results[:] = get_profile_results()
+                profile_select.set_options({
+                    index: f"{result['started_at']} {result['action']} ({result['duration'] * 1000:.0f} ms)"
+                    for index, result in enumerate(results)
+                }, value=0 if results else None)
+                show_result()
+            
+            def toggle_profiling(e):
+                set_profiling(e.value)
+                refresh()
+                ui.notify(f"Profiling {'enabled' if e.value else 'disabled'}")
+            
+            with ui.row().classes('items-center'):
+                ui.switch('Profiling mode', value=is_profiling_enabled(), on_change=toggle_profiling).classes('q-mr-md')
+                ui.button('🔄 Refresh', on_click=refresh)
+            
+            profile_select.on_value_change(lambda: show_result())
+            refresh()
+    
+    def create_sections(self):
+        """Add the profiling section after HTML template"""
+        self.create_profiling_section()
 
 
 # Create instance and function for backward compatibility
@@ -0,0 +1,25 @@
+import os
+import sys
+import importlib.util
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def load_bench_startup():
+    """Import benchmarks/bench_startup.py (the benchmarks directory is not a package)"""
+    spec = importlib.util.spec_from_file_location(
+        'bench_startup', os.path.join(PROJECT_ROOT, 'benchmarks', 'bench_startup.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_main_build_runs(monkeypatch):
+    """The startup benchmark builds the main page for a client without errors"""
+    monkeypatch.chdir(PROJECT_ROOT)
+    monkeypatch.syspath_prepend(PROJECT_ROOT)
+
+    result = load_bench_startup().measure_main_build()
+
+    assert 'error' not in result, result.get('error')
+    assert result['ms'] > 0
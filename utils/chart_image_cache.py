@@ -0,0 +1,254 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+from nicegui import run
+
+class ChartImageCache:
+    """Content-addressed cache of rendered chart images with memory and disk tiers
+
+    Images are keyed by a hash of everything that affects the rendered output.
+    The memory tier is an LRU limited by total bytes; the disk tier keeps PNG
+    files across restarts and evicts the least recently used files once its
+    byte limit is exceeded.
+    """
+
+    def __init__(self, cache_dir: Optional[str], max_memory_bytes: int = 32 * 1024 * 1024,
+                 max_disk_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        self.disk_bytes = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(chart_type: str, data: Dict[str, Any], width: float, height: float, dpi: int) -> str:
+        """Return the content hash for a chart request"""
+        payload = {
+            'chart_type': chart_type,
+            'x': data.get('x'),
+            'y': data.get('y'),
+            'title': data.get('title'),
+            'xlabel': data.get('xlabel'),
+            'ylabel': data.get('ylabel'),
+            'labels': data.get('labels'),
+            'downsample': data.get('downsample', 'auto'),
+            'source': data.get('source'),
+            'source_signature': data.get('source_signature'),
+            'size': [width, height],
+            'dpi': dpi
+        }
+        serialized = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False,
+                                default=ChartImageCache._serialize_value)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _serialize_value(value: Any) -> str:
+        """Serialize values json cannot handle (arrays are hashed by content)"""
+        if hasattr(value, 'tobytes') and hasattr(value, 'dtype'):
+            digest = hashlib.sha256(value.tobytes()).hexdigest()
+            return f'array:{value.dtype}:{value.shape}:{digest}'
+        return str(value)
+
+    def get_memory(self, key: str) -> Optional[bytes]:
+        """Get image bytes from the memory tier only"""
+        with self._lock:
+            image = self.memory.get(key)
+            if image is not None:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+            return image
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get image bytes from memory, then disk, or None on a miss"""
+        image = self.get_memory(key)
+        if image is not None:
+            return image
+        return self._get_disk(key)
+
+    async def get_async(self, key: str) -> Optional[bytes]:
+        """Like get(), with the disk tier read on a worker thread"""
+        image = self.get_memory(key)
+        if image is not None:
+            return image
+        if not self.cache_dir:
+            with self._lock:
+                self.misses += 1
+            return None
+        return await run.io_bound(self._get_disk, key)
+
+    def _get_disk(self, key: str) -> Optional[bytes]:
+        """Read image bytes from the disk tier into the memory tier"""
+        image = self._read_disk(key)
+        with self._lock:
+            if image is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._put_memory(key, image)
+        return image
+
+    def put(self, key: str, image: bytes):
+        """Store image bytes in both tiers"""
+        with self._lock:
+            self._put_memory(key, image)
+        self._write_disk(key, image)
+
+    async def put_async(self, key: str, image: bytes):
+        """Like put(), with the disk write and eviction on a worker thread"""
+        with self._lock:
+            self._put_memory(key, image)
+        if self.cache_dir:
+            await run.io_bound(self._write_disk, key, image)
+
+    def clear(self, disk: bool = False):
+        """Clear the memory tier (and optionally the disk tier)"""
+        with self._lock:
+            self.memory.clear()
+            self.memory_bytes = 0
+        if disk and self.cache_dir and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.png'):
+                    self._remove_file(os.path.join(self.cache_dir, name))
+            self.disk_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                'memory_entries': len(self.memory),
+                'memory_bytes': self.memory_bytes,
+                'disk_bytes': self.disk_bytes,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses
+            }
+
+    def _put_memory(self, key: str, image: bytes):
+        if len(image) > self.max_memory_bytes:
+            return
+        if key in self.memory:
+            self.memory_bytes -= len(self.memory.pop(key))
+        self.memory[key] = image
+        self.memory_bytes += len(image)
+        while self.memory_bytes > self.max_memory_bytes:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.png')
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                image = f.read()
+            # Mark as recently used for disk eviction
+            os.utime(path)
+            return image
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error reading cached chart: {e}")
+            return None
+
+    def _write_disk(self, key: str, image: bytes):
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if os.path.exists(path):
+                return
+
+            # Write to a temp file and rename so readers never see partial images
+            temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(image)
+            os.replace(temp_path, path)
+
+            with self._lock:
+                if self.disk_bytes is None:
+                    self.disk_bytes = self._scan_disk_bytes()
+                else:
+                    self.disk_bytes += len(image)
+                over_limit = self.disk_bytes > self.max_disk_bytes
+            if over_limit:
+                self._evict_disk()
+        except Exception as e:
+            print(f"Error writing cached chart: {e}")
+
+    def _scan_disk_bytes(self) -> int:
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.png'):
+                total += entry.stat().st_size
+        return total
+
+    def _evict_disk(self):
+        """Remove least recently used files until the disk tier fits its limit"""
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.png'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            self._remove_file(path)
+            total -= size
+
+        with self._lock:
+            self.disk_bytes = total
+
+    @staticmethod
+    def _remove_file(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# Global instance
+chart_image_cache = ChartImageCache(
+    cache_dir=os.environ.get(
+        'MYAPP_CHART_CACHE_DIR',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.chart_cache')
+    ) or None
+)
+
+# Convenience functions
+def get_cached_chart(key: str) -> Optional[bytes]:
+    """Get cached chart image bytes"""
+    return chart_image_cache.get(key)
+
+def put_cached_chart(key: str, image: bytes):
+    """Cache chart image bytes"""
+    chart_image_cache.put(key, image)
+
+async def get_cached_chart_async(key: str) -> Optional[bytes]:
+    """Get cached chart image bytes without blocking the event loop on disk reads"""
+    return await chart_image_cache.get_async(key)
+
+async def put_cached_chart_async(key: str, image: bytes):
+    """Cache chart image bytes without blocking the event loop on disk writes"""
+    await chart_image_cache.put_async(key, image)
+
+def make_chart_key(chart_type: str, data: Dict[str, Any], width: float, height: float, dpi: int) -> str:
+    """Return the content hash for a chart request"""
+    return ChartImageCache.make_key(chart_type, data, width, height, dpi)
+
+def get_chart_cache_stats() -> Dict[str, Any]:
+    """Get chart image cache statistics"""
+    return chart_image_cache.get_stats()
@@ -0,0 +1,39 @@
+import re
+from fastapi import Request
+from fastapi.responses import Response
+from nicegui import app
+from utils.chart_image_cache import get_cached_chart
+from utils.http_cache import etag_matches
+
+CHART_ROUTE = '/charts'
+
+# Chart URLs are content-addressed, so a URL never changes its image
+CHART_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_CHART_KEY_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+def get_chart_url(chart_key: str) -> str:
+    """Get the URL serving a cached chart image"""
+    return f'{CHART_ROUTE}/{chart_key}.png'
+
+
+@app.get(CHART_ROUTE + '/{chart_key}.png')
+def serve_chart_image(chart_key: str, request: Request):
+    """Serve a chart image from the chart image cache with ETag support"""
+    if not _CHART_KEY_PATTERN.match(chart_key):
+        return Response(status_code=404)
+
+    etag = f'"{chart_key}"'
+    headers = {'ETag': etag, 'Cache-Control': CHART_CACHE_CONTROL}
+
+    # Conditional GET - the browser already has this image
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    image = get_cached_chart(chart_key)
+    if image is None:
+        return Response(status_code=404)
+
+    return Response(content=image, media_type='image/png', headers=headers)
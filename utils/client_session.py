@@ -0,0 +1,45 @@
+from typing import Dict, Any
+from nicegui import app
+
+# Key of the session object in app.storage.client
+SESSION_KEY = 'myapp_session'
+
+
+class ClientSession:
+    """Mutable state of one browser client
+
+    Each client (browser tab or native window) gets its own session in
+    app.storage.client, which NiceGUI discards when the client goes away.
+    Only per-client state lives here - the page container and anything a
+    page needs to remember for this user. Loaded page data, templates,
+    rendered HTML, script bundles and chart images are immutable and
+    shared by all clients through the global caches; page data returned
+    by load_page_data must be copied before it is modified.
+    """
+
+    def __init__(self):
+        self.page_container = None
+        self.values: Dict[str, Any] = {}
+
+    @property
+    def current_page(self):
+        """Name of the page this client is looking at"""
+        return self.page_container.current_page if self.page_container else None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a per-client value"""
+        return self.values.get(key, default)
+
+    def set(self, key: str, value: Any):
+        """Set a per-client value"""
+        self.values[key] = value
+
+
+def get_client_session() -> ClientSession:
+    """Get the session of the current client, creating it on first use"""
+    storage = app.storage.client
+    session = storage.get(SESSION_KEY)
+    if session is None:
+        session = ClientSession()
+        storage[SESSION_KEY] = session
+    return session
@@ -0,0 +1,48 @@
+from fastapi.responses import PlainTextResponse
+from nicegui import app
+from utils.payload_metrics import get_payload_stats
+from utils.stage_timing import get_stage_stats, get_stage_metrics, format_prometheus_histogram
+
+DIAGNOSTICS_ROUTE = '/diagnostics'
+
+METRICS_ROUTE = '/metrics'
+
+# Prometheus text exposition format
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@app.get(DIAGNOSTICS_ROUTE + '/payloads')
+def serve_payload_stats():
+    """Serve websocket payload statistics per action and per client as JSON"""
+    return get_payload_stats()
+
+
+@app.get(DIAGNOSTICS_ROUTE + '/stages')
+def serve_stage_stats():
+    """Serve page stage latency histograms as JSON"""
+    return get_stage_stats()
+
+
+def get_payload_metrics() -> str:
+    """Get websocket payload histograms per action in Prometheus text format"""
+    actions = get_payload_stats()['actions']
+    return (
+        format_prometheus_histogram(
+            'myapp_websocket_message_bytes',
+            'Size of websocket messages sent to browsers in bytes',
+            [dict(action=action, **stats['message_bytes']) for action, stats in actions.items()],
+            ['action']
+        ) +
+        format_prometheus_histogram(
+            'myapp_websocket_action_bytes',
+            'Websocket bytes sent to a browser per action',
+            [dict(action=action, **stats['action_bytes']) for action, stats in actions.items()],
+            ['action']
+        )
+    )
+
+
+@app.get(METRICS_ROUTE)
+def serve_metrics():
+    """Serve stage latency and websocket payload histograms for Prometheus"""
+    return PlainTextResponse(get_stage_metrics() + get_payload_metrics(), media_type=METRICS_CONTENT_TYPE)
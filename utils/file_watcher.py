@@ -0,0 +1,158 @@
+import os
+import atexit
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    # Native change notifications (inotify/FSEvents/ReadDirectoryChangesW), installed with NiceGUI
+    import watchfiles
+except ImportError:
+    watchfiles = None
+
+
+class FileWatcher:
+    """Utility class for watching files on disk and notifying caches when they change
+
+    Changes are detected by comparing (mtime, size) signatures. When the
+    watchfiles package is available its native notifications are used to wake
+    up the check, otherwise the watched files are polled periodically.
+    """
+
+    def __init__(self, poll_interval: float = 1.0, use_native: bool = True):
+        self.poll_interval = poll_interval
+        self.use_native = use_native and watchfiles is not None
+        self.watched_files = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._restart_event = threading.Event()
+
+    def watch(self, file_path: str, callback: Callable[[str], None]):
+        """Watch a file and call callback(file_path) when it changes on disk
+
+        Registering a file again resets its signature to the current state,
+        so a writer can re-register after saving to skip its own change.
+        """
+        abs_path = os.path.abspath(file_path)
+        with self._lock:
+            entry = self.watched_files.get(abs_path)
+            if entry is None:
+                entry = {'signature': None, 'callbacks': {}}
+                self.watched_files[abs_path] = entry
+                # Native backend watches directories, restart it to pick up a new one
+                self._restart_event.set()
+            entry['signature'] = self._get_signature(abs_path)
+            entry['callbacks'][callback] = file_path
+
+        self.start()
+
+    def unwatch(self, file_path: str, callback: Optional[Callable[[str], None]] = None):
+        """Stop watching a file (for one callback or for all of them)"""
+        abs_path = os.path.abspath(file_path)
+        with self._lock:
+            entry = self.watched_files.get(abs_path)
+            if entry is None:
+                return
+            if callback is not None:
+                entry['callbacks'].pop(callback, None)
+            if callback is None or not entry['callbacks']:
+                del self.watched_files[abs_path]
+
+    def check_files(self, abs_paths=None) -> list:
+        """Check watched files for changes and notify callbacks
+
+        Returns the list of changed absolute paths.
+        """
+        changed = []
+        with self._lock:
+            if abs_paths is None:
+                abs_paths = list(self.watched_files)
+            for abs_path in abs_paths:
+                entry = self.watched_files.get(abs_path)
+                if entry is None:
+                    continue
+                signature = self._get_signature(abs_path)
+                if signature != entry['signature']:
+                    entry['signature'] = signature
+                    changed.append((abs_path, list(entry['callbacks'].items())))
+
+        # Run callbacks outside the lock so they can register files again
+        for abs_path, callbacks in changed:
+            for callback, file_path in callbacks:
+                try:
+                    callback(file_path)
+                except Exception as e:
+                    print(f"Error in file watch callback for {file_path}: {e}")
+
+        return [abs_path for abs_path, _ in changed]
+
+    def start(self):
+        """Start the background watch thread if it is not running"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='file-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background watch thread"""
+        self._stop_event.set()
+        self._restart_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        """Background loop - native notifications with polling fallback"""
+        if self.use_native:
+            try:
+                self._run_native()
+                return
+            except Exception as e:
+                print(f"Native file watching unavailable, falling back to polling: {e}")
+        self._run_polling()
+
+    def _run_polling(self):
+        while not self._stop_event.wait(self.poll_interval):
+            self.check_files()
+
+    def _run_native(self):
+        while not self._stop_event.is_set():
+            self._restart_event.clear()
+            with self._lock:
+                directories = {os.path.dirname(abs_path) for abs_path in self.watched_files}
+            directories = [d for d in directories if os.path.isdir(d)]
+            if not directories:
+                self._restart_event.wait(self.poll_interval)
+                continue
+
+            for changes in watchfiles.watch(*directories, stop_event=self._restart_event,
+                                            recursive=False, debounce=200, raise_interrupt=False):
+                self.check_files({os.path.abspath(path) for _, path in changes})
+
+    @staticmethod
+    def _get_signature(abs_path: str) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) for a file, or None if it does not exist"""
+        try:
+            stat = os.stat(abs_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+# Global instance (stopped at exit: the native watcher crashes if it is still running
+# while the interpreter shuts down)
+file_watcher = FileWatcher()
+atexit.register(file_watcher.stop)
+
+# Convenience functions
+def watch_file(file_path: str, callback: Callable[[str], None]):
+    """Watch a file and call callback(file_path) when it changes"""
+    file_watcher.watch(file_path, callback)
+
+def unwatch_file(file_path: str, callback: Optional[Callable[[str], None]] = None):
+    """Stop watching a file"""
+    file_watcher.unwatch(file_path, callback)
+
+def check_watched_files() -> list:
+    """Check all watched files now and return the changed paths"""
+    return file_watcher.check_files()
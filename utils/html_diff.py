@@ -0,0 +1,140 @@
+from html.parser import HTMLParser
+from typing import Dict, Any, List, Optional
+
+# Elements without an end tag
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+
+# Document-level tags the browser drops when HTML is set as innerHTML of an element
+TRANSPARENT_ELEMENTS = {'html', 'head', 'body'}
+
+
+class _Element:
+    """Parsed element: tag, attributes, children and the source span of its content"""
+
+    __slots__ = ('tag', 'attrs', 'children', 'inner_start', 'inner_end')
+
+    def __init__(self, tag: str, attrs: Dict[str, Optional[str]], inner_start: int):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+        self.inner_start = inner_start
+        self.inner_end = inner_start
+
+    def element_children(self) -> List['_Element']:
+        return [child for child in self.children if isinstance(child, _Element)]
+
+    def shape(self) -> List[Any]:
+        """Child sequence as the browser sees it: element tags and text runs"""
+        return [('element', child.tag) if isinstance(child, _Element) else child for child in self.children]
+
+
+class _TreeBuilder(HTMLParser):
+    """Builds an element tree that mirrors the DOM of HTML set as innerHTML"""
+
+    def __init__(self, source: str):
+        super().__init__(convert_charrefs=True)
+        self.source = source
+        self.line_offsets = [0]
+        # HTMLParser counts lines by '\n' only
+        for line in source.split('\n'):
+            self.line_offsets.append(self.line_offsets[-1] + len(line) + 1)
+        self.root = _Element('', {}, 0)
+        self.stack = [self.root]
+        self.malformed = False
+
+    def _offset(self) -> int:
+        line, column = self.getpos()
+        return self.line_offsets[line - 1] + column
+
+    def _append_text(self, text: str):
+        children = self.stack[-1].children
+        if children and isinstance(children[-1], str):
+            children[-1] += text
+        else:
+            children.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in TRANSPARENT_ELEMENTS:
+            return
+        inner_start = self._offset() + len(self.get_starttag_text())
+        element = _Element(tag, dict(attrs), inner_start)
+        self.stack[-1].children.append(element)
+        if tag not in VOID_ELEMENTS:
+            self.stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in TRANSPARENT_ELEMENTS:
+            return
+        inner_start = self._offset() + len(self.get_starttag_text())
+        self.stack[-1].children.append(_Element(tag, dict(attrs), inner_start))
+
+    def handle_endtag(self, tag):
+        if tag in TRANSPARENT_ELEMENTS or tag in VOID_ELEMENTS:
+            return
+        if self.stack[-1].tag != tag:
+            # Implicitly closed elements - the browser may build a different tree
+            self.malformed = True
+            return
+        element = self.stack.pop()
+        element.inner_end = self._offset()
+
+    def handle_data(self, data):
+        self._append_text(data)
+
+    def handle_comment(self, data):
+        self._append_text(f'<!--{data}-->')
+
+
+def parse_html(source: str) -> Optional[_Element]:
+    """Parse HTML into an element tree, or None when the browser's tree may differ"""
+    builder = _TreeBuilder(source)
+    builder.feed(source)
+    builder.close()
+    if builder.malformed or len(builder.stack) != 1:
+        return None
+    builder.root.inner_end = len(source)
+    return builder.root
+
+
+def _diff_element(old: _Element, new: _Element, source: str, path: List[int], patches: List[Dict[str, Any]]):
+    """Append the patches that turn old into new"""
+    if old.attrs != new.attrs:
+        # Boolean attributes have no value; None marks a removed attribute
+        attrs = {name: value or '' for name, value in new.attrs.items()
+                 if name not in old.attrs or old.attrs[name] != value}
+        attrs.update({name: None for name in old.attrs if name not in new.attrs})
+        patches.append({'path': path, 'tag': new.tag, 'attrs': attrs})
+
+    if old.shape() != new.shape():
+        # Text or child elements changed - replace this element's content
+        patches.append({'path': path, 'tag': new.tag, 'html': source[new.inner_start:new.inner_end]})
+        return
+
+    for index, (old_child, new_child) in enumerate(zip(old.element_children(), new.element_children())):
+        _diff_element(old_child, new_child, source, path + [index], patches)
+
+
+def diff_html(old_html: str, new_html: str) -> Optional[List[Dict[str, Any]]]:
+    """Compute element-level patches that turn old_html into new_html
+
+    Each patch addresses an element by its path of element-child indices
+    below the container and either sets attributes ('attrs', None removes
+    one) or replaces its content ('html'). The expected tag is included so
+    the client can detect a DOM that does not match. Returns None when the
+    change cannot be expressed below the container (or the HTML could be
+    parsed differently by the browser) - the whole content must be sent.
+    """
+    old_root = parse_html(old_html)
+    new_root = parse_html(new_html)
+    if old_root is None or new_root is None:
+        return None
+    if old_root.shape() != new_root.shape():
+        return None
+
+    patches = []
+    for index, (old_child, new_child) in enumerate(zip(old_root.element_children(), new_root.element_children())):
+        _diff_element(old_child, new_child, new_html, [index], patches)
+    return patches
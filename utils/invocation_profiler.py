@@ -0,0 +1,289 @@
+import os
+import re
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from collections import deque
+from typing import Dict, Any, List, Optional
+from nicegui import run, background_tasks
+
+# Profile page switches and chart renders from startup (MYAPP_PROFILE=1); can be toggled at runtime
+PROFILING = os.environ.get('MYAPP_PROFILE', '0') == '1'
+
+# Project root (utils/ -> project root)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Directory of the per-invocation profile files
+PROFILE_DIR = os.environ.get('MYAPP_PROFILE_DIR', os.path.join(_PROJECT_ROOT, '.profiles'))
+
+# Invocations whose profile files are kept (older ones are deleted)
+MAX_PROFILES = int(os.environ.get('MYAPP_PROFILE_KEEP', '20'))
+
+# Functions and allocation sites listed in a summary
+TOP_N = 15
+
+# Stack frames stored per traced allocation
+TRACEMALLOC_FRAMES = 1
+
+# <date>-<time>-<ms>-<action>.prof/.txt - only these files are rotated
+_PROFILE_FILE_PATTERN = re.compile(r'^\d{8}-\d{6}-\d{3}-[\w-]+\.(prof|txt)$')
+
+class _NullProfile:
+    """Async context manager that does nothing (contextlib.nullcontext is async only from 3.10)"""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+# Returned by profile() when profiling is off - entering it costs next to nothing
+_NULL_PROFILE = _NullProfile()
+
+
+class _Invocation:
+    """Async context manager profiling one invocation with cProfile and tracemalloc"""
+
+    def __init__(self, profiler: 'InvocationProfiler', action: str):
+        self.profiler = profiler
+        self.action = action
+        self.profile = None
+
+    async def __aenter__(self):
+        if not self.profiler._acquire():
+            return self
+        self.snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        if self.snapshot is not None:
+            tracemalloc.reset_peak()
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (a debugger, an outside cProfile run) is active
+            self.profiler._release(skipped=True)
+            return self
+        self.profile = profile
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self.profile is None:
+            return False
+        self.profile.disable()
+        duration = time.perf_counter() - self.start
+        snapshot = None
+        peak_memory = None
+        if self.snapshot is not None and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        self.profiler._release()
+
+        # Files and summaries are written in the background so the handler returns now
+        background_tasks.create(run.io_bound(
+            self.profiler.save, self.action, self.started_at, duration,
+            self.profile, self.snapshot, snapshot, peak_memory
+        ), name=f'save profile {self.action}')
+        return False
+
+
+class InvocationProfiler:
+    """Opt-in cProfile/tracemalloc profiling of individual user actions
+
+    While enabled, each action wrapped in profile() is run under cProfile
+    and between two tracemalloc snapshots. Its profile is written to
+    <profile_dir>/<time>-<action>.prof (open with pstats or snakeviz) next
+    to a .txt summary of the top functions and allocation sites; only the
+    last max_profiles invocations are kept. cProfile sees everything the
+    event loop runs meanwhile, so other clients' work can show up in a
+    profile. One invocation is profiled at a time - concurrent ones are
+    skipped. When disabled, profile() returns a shared no-op context
+    manager and tracemalloc is stopped.
+    """
+
+    def __init__(self, enabled: bool = False, profile_dir: str = PROFILE_DIR,
+                 max_profiles: int = MAX_PROFILES, top_n: int = TOP_N):
+        self.enabled = False
+        self.profile_dir = profile_dir
+        self.max_profiles = max_profiles
+        self.top_n = top_n
+        self.results = deque(maxlen=max_profiles)
+        self.active = False
+        self.profiled = 0
+        self.skipped = 0
+        self.started_tracemalloc = False
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.set_enabled(enabled)
+
+    def set_enabled(self, enabled: bool):
+        """Turn profiling on or off (tracemalloc only traces while it is on)"""
+        with self._lock:
+            if enabled == self.enabled:
+                return
+            if enabled and not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                self.started_tracemalloc = True
+            elif not enabled and self.started_tracemalloc:
+                # Leave tracing started elsewhere (PYTHONTRACEMALLOC) alone
+                tracemalloc.stop()
+                self.started_tracemalloc = False
+            self.enabled = enabled
+
+    def profile(self, action: str):
+        """Async context manager profiling the block as one invocation of action"""
+        if not self.enabled:
+            return _NULL_PROFILE
+        return _Invocation(self, action)
+
+    def _acquire(self) -> bool:
+        """Claim the profiler for one invocation"""
+        with self._lock:
+            if self.active or not self.enabled:
+                self.skipped += 1
+                return False
+            self.active = True
+            return True
+
+    def _release(self, skipped: bool = False):
+        """Free the profiler after an invocation"""
+        with self._lock:
+            self.active = False
+            if skipped:
+                self.skipped += 1
+
+    def save(self, action: str, started_at: float, duration: float, profile: cProfile.Profile,
+             snapshot_before: Optional[tracemalloc.Snapshot], snapshot_after: Optional[tracemalloc.Snapshot],
+             peak_memory: Optional[int]) -> Dict[str, Any]:
+        """Write the profile files of an invocation and keep its summary"""
+        result = {
+            'action': action,
+            'started_at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(started_at)),
+            'duration': duration,
+            'peak_memory': peak_memory,
+            'functions': self.summarize_functions(profile),
+            'allocations': self.summarize_allocations(snapshot_before, snapshot_after),
+            'file': None
+        }
+
+        with self._write_lock:
+            try:
+                os.makedirs(self.profile_dir, exist_ok=True)
+                stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(started_at))
+                name = f'{stamp}-{int(started_at * 1000) % 1000:03d}-{action}'
+                profile_path = os.path.join(self.profile_dir, name + '.prof')
+                profile.dump_stats(profile_path)
+                with open(os.path.join(self.profile_dir, name + '.txt'), 'w', encoding='utf-8') as f:
+                    f.write(self.format_summary(result))
+                result['file'] = profile_path
+                self._rotate()
+            except OSError as e:
+                print(f"Error writing profile of {action}: {e}")
+
+        with self._lock:
+            self.results.append(result)
+            self.profiled += 1
+        return result
+
+    def _rotate(self):
+        """Delete the files of all but the newest max_profiles invocations"""
+        names = sorted({
+            os.path.splitext(filename)[0] for filename in os.listdir(self.profile_dir)
+            if _PROFILE_FILE_PATTERN.match(filename)
+        })
+        for name in names[:-self.max_profiles] if self.max_profiles > 0 else names:
+            for extension in ('.prof', '.txt'):
+                path = os.path.join(self.profile_dir, name + extension)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def summarize_functions(self, profile: cProfile.Profile) -> List[Dict[str, Any]]:
+        """Top functions by cumulative time"""
+        stats = pstats.Stats(profile).stats
+        top = sorted(stats.items(), key=lambda item: -item[1][3])[:self.top_n]
+        return [
+            {
+                'function': f'{function} ({os.path.basename(filename)}:{line})',
+                'calls': calls,
+                'total_time': total_time,
+                'cumulative_time': cumulative_time
+            }
+            for (filename, line, function), (_, calls, total_time, cumulative_time, _) in top
+        ]
+
+    def summarize_allocations(self, snapshot_before: Optional[tracemalloc.Snapshot],
+                              snapshot_after: Optional[tracemalloc.Snapshot]) -> List[Dict[str, Any]]:
+        """Top allocation sites by memory growth during the invocation"""
+        if snapshot_before is None or snapshot_after is None:
+            return []
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        differences = snapshot_after.filter_traces(ignore).compare_to(snapshot_before.filter_traces(ignore), 'lineno')
+        top = sorted(differences, key=lambda stat: -stat.size_diff)[:self.top_n]
+        return [
+            {
+                'location': f'{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}',
+                'size_diff': stat.size_diff,
+                'count_diff': stat.count_diff
+            }
+            for stat in top if stat.size_diff > 0
+        ]
+
+    @staticmethod
+    def format_summary(result: Dict[str, Any]) -> str:
+        """Plain-text summary of an invocation"""
+        lines = [f"{result['action']} at {result['started_at']}: {result['duration'] * 1000:.1f} ms"]
+        if result['peak_memory'] is not None:
+            lines.append(f"Peak traced memory: {result['peak_memory'] / 1024:.1f} KB")
+        lines.append('')
+        lines.append(f"{'cumulative s':>12} {'own s':>10} {'calls':>8}  function")
+        for entry in result['functions']:
+            lines.append(f"{entry['cumulative_time']:12.4f} {entry['total_time']:10.4f} {entry['calls']:8d}  {entry['function']}")
+        lines.append('')
+        lines.append(f"{'size +KB':>12} {'blocks +':>10}  allocated at")
+        for entry in result['allocations']:
+            lines.append(f"{entry['size_diff'] / 1024:12.1f} {entry['count_diff']:10d}  {entry['location']}")
+        return '\n'.join(lines) + '\n'
+
+    def get_results(self) -> List[Dict[str, Any]]:
+        """Summaries of the kept invocations, newest first"""
+        with self._lock:
+            return list(reversed(self.results))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get profiler status"""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'profiled': self.profiled,
+                'skipped': self.skipped,
+                'profile_dir': os.path.abspath(self.profile_dir),
+                'max_profiles': self.max_profiles
+            }
+
+
+# Global instance
+invocation_profiler = InvocationProfiler(enabled=PROFILING)
+
+# Convenience functions
+def profile_invocation(action: str):
+    """Async context manager profiling the block while profiling mode is on"""
+    return invocation_profiler.profile(action)
+
+def set_profiling(enabled: bool):
+    """Turn profiling mode on or off"""
+    invocation_profiler.set_enabled(enabled)
+
+def is_profiling_enabled() -> bool:
+    """Check whether profiling mode is on"""
+    return invocation_profiler.enabled
+
+def get_profile_results() -> List[Dict[str, Any]]:
+    """Summaries of the recently profiled invocations, newest first"""
+    return invocation_profiler.get_results()
+
+def get_profiler_stats() -> Dict[str, Any]:
+    """Get profiler status"""
+    return invocation_profiler.get_stats()
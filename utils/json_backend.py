@@ -0,0 +1,96 @@
+import os
+import json
+from typing import Any, Callable, Dict
+
+# JSON library: 'auto' (fastest installed), 'orjson' or 'json' (stdlib)
+JSON_BACKEND = os.environ.get('MYAPP_JSON_BACKEND', 'auto')
+
+
+class JsonBackend:
+    """A JSON library behind one interface
+
+    loads() accepts bytes or str; dumps_pretty() returns UTF-8 bytes
+    formatted like json.dump(indent=2, ensure_ascii=False). Decode errors
+    are ValueError subclasses with every backend.
+    """
+
+    def __init__(self, name: str, loads: Callable[[Any], Any], dumps_pretty: Callable[[Any], bytes]):
+        self.name = name
+        self.loads = loads
+        self.dumps_pretty = dumps_pretty
+
+
+def _stdlib_backend() -> JsonBackend:
+    return JsonBackend(
+        'json',
+        json.loads,
+        lambda data: json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    )
+
+
+def _orjson_backend() -> JsonBackend:
+    import orjson
+    stdlib = _stdlib_backend()
+
+    def dumps_pretty(data: Any) -> bytes:
+        try:
+            # Non-str keys are written as strings, like the stdlib does
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Data orjson cannot encode (e.g. ints beyond 64 bits)
+            return stdlib.dumps_pretty(data)
+
+    return JsonBackend('orjson', orjson.loads, dumps_pretty)
+
+
+# Backends in order of preference for 'auto'
+BACKENDS: Dict[str, Callable[[], JsonBackend]] = {
+    'orjson': _orjson_backend,
+    'json': _stdlib_backend,
+}
+
+
+def register_json_backend(name: str, factory: Callable[[], JsonBackend]):
+    """Add a backend factory, tried first by 'auto' (it raises ImportError when its library is missing)"""
+    backends = [(name, factory)] + [(key, value) for key, value in BACKENDS.items() if key != name]
+    BACKENDS.clear()
+    BACKENDS.update(backends)
+
+
+def select_json_backend(name: str = 'auto') -> JsonBackend:
+    """Create the named backend, or the first installed one for 'auto'"""
+    if name != 'auto':
+        return BACKENDS[name]()
+    for factory in BACKENDS.values():
+        try:
+            return factory()
+        except ImportError:
+            continue
+    return _stdlib_backend()
+
+
+# Global backend
+json_backend = select_json_backend(JSON_BACKEND)
+
+# Convenience functions
+def set_json_backend(name: str):
+    """Switch the JSON backend ('auto', 'orjson', 'json' or a registered name)"""
+    global json_backend
+    json_backend = select_json_backend(name)
+
+def get_json_backend_name() -> str:
+    """Get the name of the active JSON backend"""
+    return json_backend.name
+
+def json_loads(text: Any) -> Any:
+    """Parse JSON from bytes or str"""
+    return json_backend.loads(text)
+
+def json_dumps_pretty(data: Any) -> bytes:
+    """Serialize data as indented UTF-8 JSON"""
+    return json_backend.dumps_pretty(data)
+
+def load_json_file(file_path: str) -> Any:
+    """Read and parse a JSON file"""
+    with open(file_path, 'rb') as f:
+        return json_backend.loads(f.read())
@@ -0,0 +1,133 @@
+import os
+import pickle
+import contextlib
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+from utils.json_backend import load_json_file
+
+# Project root (utils/ -> project root)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Directory of parsed-data snapshots (MYAPP_DATA_SNAPSHOT_DIR; empty disables them)
+SNAPSHOT_DIR = os.environ.get('MYAPP_DATA_SNAPSHOT_DIR', os.path.join(_PROJECT_ROOT, '.data_cache'))
+
+# Files smaller than this are parsed directly (a snapshot would not be faster)
+MIN_SNAPSHOT_BYTES = 64 * 1024
+
+# Snapshots kept on disk (least recently used are deleted beyond this)
+MAX_SNAPSHOTS = int(os.environ.get('MYAPP_DATA_SNAPSHOT_MAX', '32'))
+
+_SNAPSHOT_VERSION = 1
+
+
+class JsonSnapshotCache:
+    """Binary snapshots of parsed JSON files, reused while the file is unchanged
+
+    After a JSON file is parsed, the result is pickled to the snapshot
+    directory together with the file's path, mtime and size. Later loads
+    (including after a restart) unpickle the snapshot instead of parsing
+    when mtime and size still match. Snapshots are local, written only by
+    this cache and never shared between machines. Only page data files are
+    loaded through it; at most max_snapshots are kept, the least recently
+    used are deleted.
+    """
+
+    def __init__(self, snapshot_dir: Optional[str], min_bytes: int = 64 * 1024,
+                 max_snapshots: int = MAX_SNAPSHOTS):
+        self.snapshot_dir = snapshot_dir
+        self.min_bytes = min_bytes
+        self.max_snapshots = max_snapshots
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _snapshot_path(self, abs_path: str) -> str:
+        digest = hashlib.sha1(abs_path.encode('utf-8')).hexdigest()
+        return os.path.join(self.snapshot_dir, f'{digest}.pickle')
+
+    def load(self, file_path: str) -> Any:
+        """Load a JSON file, from its snapshot when it is still valid"""
+        if not self.snapshot_dir:
+            return load_json_file(file_path)
+
+        abs_path = os.path.abspath(file_path)
+        stat = os.stat(abs_path)
+        if stat.st_size < self.min_bytes:
+            return load_json_file(abs_path)
+
+        signature = (_SNAPSHOT_VERSION, abs_path, stat.st_mtime_ns, stat.st_size)
+        snapshot_path = self._snapshot_path(abs_path)
+        try:
+            with open(snapshot_path, 'rb') as f:
+                snapshot_signature, data = pickle.load(f)
+            if snapshot_signature == signature:
+                with self._lock:
+                    self.hits += 1
+                # Mark as recently used for eviction
+                with contextlib.suppress(OSError):
+                    os.utime(snapshot_path)
+                return data
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Ignoring unreadable data snapshot {snapshot_path}: {e}")
+
+        with self._lock:
+            self.misses += 1
+        data = load_json_file(abs_path)
+        self._write_snapshot(snapshot_path, signature, data)
+        return data
+
+    def _write_snapshot(self, snapshot_path: str, signature: tuple, data: Any):
+        """Store a snapshot atomically (failures only cost the next parse)"""
+        temp_path = f'{snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                pickle.dump((signature, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, snapshot_path)
+            self._evict()
+        except Exception as e:
+            print(f"Error writing data snapshot: {e}")
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _evict(self):
+        """Delete the least recently used snapshots beyond max_snapshots"""
+        with os.scandir(self.snapshot_dir) as entries:
+            snapshots = [(entry.stat().st_mtime_ns, entry.path) for entry in entries
+                         if entry.name.endswith('.pickle')]
+        if len(snapshots) <= self.max_snapshots:
+            return
+        snapshots.sort()
+        for _, path in snapshots[:len(snapshots) - self.max_snapshots]:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+    def clear(self):
+        """Delete all snapshots"""
+        if not self.snapshot_dir or not os.path.isdir(self.snapshot_dir):
+            return
+        for name in os.listdir(self.snapshot_dir):
+            if name.endswith('.pickle'):
+                os.remove(os.path.join(self.snapshot_dir, name))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            return {'enabled': bool(self.snapshot_dir), 'hits': self.hits, 'misses': self.misses}
+
+
+# Global instance
+json_snapshot_cache = JsonSnapshotCache(SNAPSHOT_DIR or None, min_bytes=MIN_SNAPSHOT_BYTES)
+
+# Convenience functions
+def load_json_snapshot(file_path: str) -> Any:
+    """Load a JSON file through the snapshot cache"""
+    return json_snapshot_cache.load(file_path)
+
+def get_json_snapshot_stats():
+    """Get snapshot cache statistics"""
+    return json_snapshot_cache.get_stats()
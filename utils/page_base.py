@@ -1,14 +1,19 @@
 from abc import ABC, abstractmethod
-from nicegui import ui
+from nicegui import ui, core, background_tasks
 import sys
 import os
 import inspect
+import weakref
 
 # Add utils directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from utils.page_template_loader import load_template
+from utils.page_template_loader import load_template, render_template_string, update_template, PATCH_SCRIPT
+from utils.page_render_cache import get_rendered_page, put_rendered_page
 from utils.page_script_loader import load_script, load_json
-from utils.page_data_loader import load_page_data
+from utils.page_data_loader import (
+    load_page_data, load_page_data_async, add_page_data_listener, get_page_data_version
+)
+from utils.stage_timing import page_timing, stage_span
 
 
 class BasePage(ABC):
@@ -23,6 +28,9 @@ class BasePage(ABC):
     def __init__(self, page_name: str):
         self.page_name = page_name
         self.page_dir = os.path.dirname(self._get_page_file_path())
+        # Template containers of this page built for any client (patched when the data changes)
+        self.page_containers = weakref.WeakSet()
+        add_page_data_listener(page_name, self._on_page_data_changed)
     
     def _get_page_file_path(self) -> str:
         """Get the path to the current page file"""
@@ -105,37 +113,105 @@ class BasePage(ABC):
                    show_script_loader: bool = False, show_json_loader: bool = False):
         """Create page using HTML template as foundation (Angular-like approach)"""
         
-        # Load page data from JSON file
-        page_data = load_page_data(self.page_name)
-        
-        # Set default template filename if not provided
-        if template_filename is None:
-            template_filename = f'{self.page_name}_template.html'
+        # Time each stage of the page build (served on /metrics)
+        with page_timing(self.page_name):
+            # Load page data from JSON file
+            with stage_span('load_page_data'):
+                page_data = load_page_data(self.page_name)
+            
+            # Set default template filename if not provided
+            if template_filename is None:
+                template_filename = f'{self.page_name}_template.html'
+            
+            # Set default handler script if not provided
+            if handler_script is None:
+                handler_script = f'pages/{self.page_name}/{self.page_name}_handler.js'
+            
+            # Load handler script first (pages without one skip this stage)
+            with stage_span('load_script'):
+                if os.path.exists(handler_script):
+                    load_script(handler_script)
+            
+            # Load and render the page using HTML template from file
+            template_path = os.path.join(self.page_dir, template_filename)
+            with stage_span('load_template'):
+                html_container = self.load_page_template(template_path, page_data)
+            
+            if html_container:
+                # Add page-specific sections after HTML template
+                with stage_span('create_sections'):
+                    self.create_sections()
+                
+                # Add optional sections
+                if show_script_loader:
+                    self.create_script_loader_section()
+                
+                if show_json_loader:
+                    self.create_json_loader_section()
+                
+                return html_container
+            else:
+                # Show message if template loading failed
+                ui.label(f'{self.page_name.title()} page could not be loaded.').classes('text-h6 q-mb-md text-center text-red')
+                return None
+    
+    def create_sections(self):
+        """Add page-specific NiceGUI sections below the template (override in subclasses)"""
+        pass
+    
+    def load_page_template(self, template_path: str, page_data: dict = None):
+        """Load page template, reusing the rendered HTML while template and data are unchanged"""
+        # Lets update_page_template patch the page instead of resending it
+        load_script(PATCH_SCRIPT)
         
-        # Set default handler script if not provided
-        if handler_script is None:
-            handler_script = f'pages/{self.page_name}/{self.page_name}_handler.js'
+        html_container = None
+        # Loaded page data has a version, so a cache hit does not hash the data
+        version = get_page_data_version(self.page_name, page_data)
+        if page_data:
+            rendered_html = get_rendered_page(template_path, page_data, version)
+            if rendered_html is not None:
+                html_container = render_template_string(rendered_html)
         
-        # Load handler script first
-        load_script(handler_script)
+        if html_container is None:
+            html_container = load_template(template_path, page_data)
+            if html_container and page_data:
+                put_rendered_page(template_path, page_data, html_container.content, self.page_name, version)
         
-        # Load and render the page using HTML template from file
+        if html_container and template_path == self._default_template_path():
+            self.page_containers.add(html_container)
+        return html_container
+    
+    async def update_page_template(self, html_container, page_data: dict, template_filename: str = None):
+        """Show new page data in a page built by create_page, sending only what changed"""
+        if template_filename is None:
+            template_filename = f'{self.page_name}_template.html'
         template_path = os.path.join(self.page_dir, template_filename)
-        html_container = load_template(template_path, page_data)
-        
-        if html_container:
-            # Add optional sections
-            if show_script_loader:
-                self.create_script_loader_section()
-            
-            if show_json_loader:
-                self.create_json_loader_section()
-            
-            return html_container
-        else:
-            # Show message if template loading failed
-            ui.label(f'{self.page_name.title()} page could not be loaded.').classes('text-h6 q-mb-md text-center text-red')
-            return None
+        return await update_template(html_container, template_path, page_data)
+    
+    def _default_template_path(self) -> str:
+        """Path of the page's own template"""
+        return os.path.join(self.page_dir, f'{self.page_name}_template.html')
+    
+    def _on_page_data_changed(self, page_name: str):
+        """Page data listener - refresh the open pages (may run on the file watcher thread)"""
+        if core.loop is None or not self.page_containers:
+            return
+        core.loop.call_soon_threadsafe(
+            lambda: background_tasks.create(self.refresh_page_containers(), name=f'refresh {page_name}')
+        )
+    
+    async def refresh_page_containers(self):
+        """Patch every open page of this kind with the current page data"""
+        page_data = await load_page_data_async(self.page_name)
+        if not page_data:
+            return
+        for html_container in list(self.page_containers):
+            if html_container.is_deleted or not html_container.client.has_socket_connection:
+                continue
+            try:
+                await self.update_page_template(html_container, page_data)
+            except Exception as e:
+                print(f"Error refreshing {self.page_name} page: {e}")
     
     def get_page_specific_config(self):
         """Return page-specific configuration"""
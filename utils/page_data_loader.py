@@ -1,6 +1,14 @@
 import os
 import json
-from typing import Dict, Any, Optional
+import asyncio
+import itertools
+from typing import Dict, Any, Callable, Optional
+from nicegui import run
+from utils.file_watcher import watch_file
+from utils.page_render_cache import invalidate_rendered_page
+from utils.page_data_writer import write_page_data_file, page_data_writer
+from utils.json_snapshot_cache import load_json_snapshot
+from utils.json_backend import load_json_file
 
 class PageDataLoader:
     """Utility class for loading page data from JSON files"""
@@ -8,6 +16,13 @@ class PageDataLoader:
     def __init__(self, data_dir: str = "pages"):
         self.data_dir = data_dir
         self.cached_data = {}
+        self.data_files = {}
+        self.pending_loads = {}
+        # page name -> (data, version); the version identifies one loaded or saved data object
+        self.data_versions = {}
+        self._version_counter = itertools.count(1)
+        # page name -> callbacks run when its data changes (saved or edited on disk)
+        self.data_listeners = {}
     
     def load_page_data(self, page_name: str) -> Optional[Dict[str, Any]]:
         """Load page data from JSON file"""
@@ -19,12 +34,16 @@ class PageDataLoader:
             # Construct file path - now pages have their data in their own directories
             file_path = os.path.join("pages", page_name, f"{page_name}_data.json")
             
-            # Load JSON data
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Load JSON data (from the parsed snapshot while the file is unchanged)
+            data = load_json_snapshot(file_path)
             
             # Cache the data
             self.cached_data[page_name] = data
+            self._set_version(page_name, data)
+            self.data_files[page_name] = file_path
+            
+            # Drop the cached data when the file is edited
+            watch_file(file_path, self._on_data_file_changed)
             
             return data
             
@@ -38,11 +57,38 @@ class PageDataLoader:
             print(f"Error loading page data: {e}")
             return None
     
+    async def load_page_data_async(self, page_name: str) -> Optional[Dict[str, Any]]:
+        """Load page data without blocking the event loop
+        
+        The file is read and parsed on a worker thread. Concurrent requests
+        for the same uncached page share one load and all receive its result.
+        """
+        if page_name in self.cached_data:
+            return self.cached_data[page_name]
+        
+        # Join a load that is already in flight, or start one. The load runs as
+        # its own task, so a caller that is cancelled (client disconnect) does
+        # not cancel it for the others waiting on it.
+        pending = self.pending_loads.get(page_name)
+        if pending is None:
+            pending = asyncio.ensure_future(run.io_bound(self.load_page_data, page_name))
+            self.pending_loads[page_name] = pending
+            pending.add_done_callback(lambda task: self._on_load_done(page_name, task))
+        return await asyncio.shield(pending)
+    
+    def _on_load_done(self, page_name: str, task: asyncio.Future):
+        """Forget a finished shared load"""
+        if self.pending_loads.get(page_name) is task:
+            del self.pending_loads[page_name]
+        # Mark the exception as retrieved when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+    
     def load_custom_data(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Load custom JSON data from any file path"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            # Parsed directly - only page data files get snapshots
+            return load_json_file(file_path)
         except FileNotFoundError:
             print(f"Data file not found: {file_path}")
             return None
@@ -54,20 +100,25 @@ class PageDataLoader:
             return None
     
     def save_page_data(self, page_name: str, data: Dict[str, Any]) -> bool:
-        """Save page data to JSON file"""
+        """Save page data to JSON file
+        
+        The cache is updated immediately; the file is written behind on a
+        background thread (atomically), coalescing rapid saves into one
+        write. data must not be modified after it is saved.
+        """
         try:
             file_path = os.path.join("pages", page_name, f"{page_name}_data.json")
             
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            # Save data
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
             # Update cache
             self.cached_data[page_name] = data
+            self._set_version(page_name, data)
+            self.data_files[page_name] = file_path
+            invalidate_rendered_page(page_name)
+            
+            # Re-register after writing so our own write is not reported as an external change
+            write_page_data_file(file_path, data, self._on_data_file_written)
             
+            self._notify_data_changed(page_name)
             return True
             
         except Exception as e:
@@ -94,6 +145,55 @@ class PageDataLoader:
             print(f"Error getting available pages: {e}")
             return []
     
+    def invalidate_page_data(self, page_name: str):
+        """Remove one page from the data cache so it is read again on next load"""
+        self.cached_data.pop(page_name, None)
+        invalidate_rendered_page(page_name)
+        self._notify_data_changed(page_name)
+    
+    def _set_version(self, page_name: str, data: Any):
+        """Give newly loaded or saved page data a new version"""
+        self.data_versions[page_name] = (data, next(self._version_counter))
+    
+    def get_data_version(self, page_name: str, data: Any) -> Optional[int]:
+        """Version of data if it is the page's current cached data object, else None
+        
+        Cached page data is never modified in place, so the version stands for
+        its content and can key caches without hashing the data.
+        """
+        entry = self.data_versions.get(page_name)
+        if entry is not None and entry[0] is data:
+            return entry[1]
+        return None
+    
+    def add_data_listener(self, page_name: str, callback: Callable[[str], None]):
+        """Call callback(page_name) whenever the page's data changes
+        
+        Callbacks may run on the file watcher thread.
+        """
+        self.data_listeners.setdefault(page_name, []).append(callback)
+    
+    def _notify_data_changed(self, page_name: str):
+        """Run the data listeners of a page"""
+        for callback in self.data_listeners.get(page_name, []):
+            try:
+                callback(page_name)
+            except Exception as e:
+                print(f"Error in page data listener for {page_name}: {e}")
+    
+    def _on_data_file_written(self, file_path: str):
+        """Write-behind callback - watch the file again from its new state"""
+        watch_file(file_path, self._on_data_file_changed)
+    
+    def _on_data_file_changed(self, file_path: str):
+        """File watch callback - invalidate the pages backed by file_path"""
+        # The cache already holds data that is newer than the file
+        if page_data_writer.has_pending(file_path):
+            return
+        for page_name, data_file in list(self.data_files.items()):
+            if data_file == file_path:
+                self.invalidate_page_data(page_name)
+    
     def clear_cache(self):
         """Clear the data cache"""
         self.cached_data.clear()
@@ -106,10 +206,22 @@ def load_page_data(page_name: str) -> Optional[Dict[str, Any]]:
     """Load page data from JSON file"""
     return page_data_loader.load_page_data(page_name)
 
+async def load_page_data_async(page_name: str) -> Optional[Dict[str, Any]]:
+    """Load page data from JSON file on a worker thread (concurrent loads are shared)"""
+    return await page_data_loader.load_page_data_async(page_name)
+
 def load_custom_data(file_path: str) -> Optional[Dict[str, Any]]:
     """Load custom JSON data from any file path"""
     return page_data_loader.load_custom_data(file_path)
 
+def get_page_data_version(page_name: str, data: Any) -> Optional[int]:
+    """Version of data if it is the page's current cached data, else None"""
+    return page_data_loader.get_data_version(page_name, data)
+
+def add_page_data_listener(page_name: str, callback: Callable[[str], None]):
+    """Call callback(page_name) whenever the page's data changes"""
+    page_data_loader.add_data_listener(page_name, callback)
+
 def save_page_data(page_name: str, data: Dict[str, Any]) -> bool:
     """Save page data to JSON file"""
     return page_data_loader.save_page_data(page_name, data)
@@ -0,0 +1,173 @@
+import os
+import time
+import atexit
+import threading
+from typing import Dict, Any, Callable, Optional
+from utils.json_backend import json_dumps_pretty
+
+# Seconds to wait for more updates before a page data file is written
+WRITE_DELAY = float(os.environ.get('MYAPP_DATA_WRITE_DELAY', '0.5'))
+
+# A file that keeps changing is still written at least this often (seconds)
+MAX_WRITE_DELAY = 5.0
+
+
+def write_json_atomic(file_path: str, data: Any):
+    """Write JSON so the file holds either the old or the new content, never a mix
+
+    The data goes to a temporary file in the same directory, is fsynced
+    and then renamed over the target.
+    """
+    directory = os.path.dirname(file_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f'.{os.path.basename(file_path)}.{os.getpid()}.tmp')
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(json_dumps_pretty(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    # Persist the rename itself (not supported on Windows)
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class WriteBehindWriter:
+    """Coalesces JSON file writes and performs them on a background thread
+
+    write() only records the latest data for a file. The file is written
+    once no update arrived for `delay` seconds (or after `max_delay`
+    seconds of continuous updates), so a burst of edits costs one write.
+    flush() writes everything pending immediately; it runs on shutdown.
+    A file counts as pending until its write and callback have finished.
+    """
+
+    def __init__(self, delay: float = 0.5, max_delay: float = 5.0):
+        self.delay = delay
+        self.max_delay = max_delay
+        self.pending = {}
+        # Files being written right now (path -> number of writes in progress)
+        self.writing = {}
+        self.written_sequence = {}
+        self.sequence = 0
+        self.writes = 0
+        self.coalesced = 0
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+
+    def write(self, file_path: str, data: Any, on_written: Optional[Callable[[str], None]] = None):
+        """Schedule data to be written to file_path (replaces any pending data)"""
+        now = time.monotonic()
+        with self._condition:
+            entry = self.pending.get(file_path)
+            if entry is None:
+                entry = {'first': now}
+                self.pending[file_path] = entry
+            else:
+                self.coalesced += 1
+            self.sequence += 1
+            entry.update(data=data, on_written=on_written, sequence=self.sequence,
+                         due=min(now + self.delay, entry['first'] + self.max_delay))
+            self._ensure_thread()
+            self._condition.notify()
+
+    def flush(self):
+        """Write all pending files now"""
+        with self._condition:
+            entries = list(self.pending.items())
+            self.pending.clear()
+            for file_path, _ in entries:
+                self._start_writing(file_path)
+        for file_path, entry in entries:
+            self._write_entry(file_path, entry)
+
+    def has_pending(self, file_path: str = None) -> bool:
+        """Check whether a file (or any file) is waiting to be written"""
+        with self._condition:
+            if file_path:
+                return file_path in self.pending or file_path in self.writing
+            return bool(self.pending or self.writing)
+
+    def _start_writing(self, file_path: str):
+        """Mark a file as being written (caller holds the condition)"""
+        self.writing[file_path] = self.writing.get(file_path, 0) + 1
+
+    def _finish_writing(self, file_path: str):
+        """Unmark a file once its write and callback are done"""
+        with self._condition:
+            count = self.writing.pop(file_path) - 1
+            if count:
+                self.writing[file_path] = count
+
+    def _ensure_thread(self):
+        """Start the writer thread on first use (caller holds the condition)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='page-data-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """Write files as they become due"""
+        while True:
+            with self._condition:
+                while not self.pending:
+                    self._condition.wait()
+                now = time.monotonic()
+                due = {path: entry for path, entry in self.pending.items() if entry['due'] <= now}
+                if not due:
+                    self._condition.wait(min(entry['due'] for entry in self.pending.values()) - now)
+                    continue
+                for file_path in due:
+                    del self.pending[file_path]
+                    self._start_writing(file_path)
+            for file_path, entry in due.items():
+                self._write_entry(file_path, entry)
+
+    def _write_entry(self, file_path: str, entry: Dict[str, Any]):
+        """Write one file and report it to its callback (the file was marked as being written)"""
+        try:
+            # One writer at a time, so a flush cannot interleave with the thread
+            with self._write_lock:
+                # Never replace newer data that was written meanwhile
+                if entry['sequence'] <= self.written_sequence.get(file_path, 0):
+                    return
+                write_json_atomic(file_path, entry['data'])
+                self.written_sequence[file_path] = entry['sequence']
+                self.writes += 1
+            if entry['on_written'] is not None:
+                entry['on_written'](file_path)
+        except Exception as e:
+            print(f"Error writing page data file {file_path}: {e}")
+        finally:
+            self._finish_writing(file_path)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get writer statistics"""
+        with self._condition:
+            return {'pending': len(self.pending), 'writing': len(self.writing), 'writes': self.writes, 'coalesced': self.coalesced}
+
+
+# Global instance (pending writes are flushed at interpreter exit as well as on app shutdown)
+page_data_writer = WriteBehindWriter(delay=WRITE_DELAY, max_delay=MAX_WRITE_DELAY)
+atexit.register(page_data_writer.flush)
+
+# Convenience functions
+def write_page_data_file(file_path: str, data: Any, on_written: Optional[Callable[[str], None]] = None):
+    """Schedule a page data file write"""
+    page_data_writer.write(file_path, data, on_written)
+
+def flush_page_data_writes():
+    """Write all pending page data files now"""
+    page_data_writer.flush()
+
+def get_page_data_writer_stats():
+    """Get writer statistics"""
+    return page_data_writer.get_stats()
@@ -0,0 +1,39 @@
+// Applies element-level patches computed by utils/html_diff.py to a page template.
+// Returns false when the DOM does not match, so the server sends the full content.
+
+window.myappApplyPatches = function(rootId, patches) {
+    const root = document.getElementById(rootId);
+    if (!root) {
+        return false;
+    }
+    
+    // Resolve every target first so a mismatch leaves the page untouched
+    const targets = [];
+    for (const patch of patches) {
+        let node = root;
+        for (const index of patch.path) {
+            node = node ? node.children[index] : null;
+        }
+        if (!node || node.tagName.toLowerCase() !== patch.tag) {
+            return false;
+        }
+        targets.push(node);
+    }
+    
+    patches.forEach(function(patch, i) {
+        const node = targets[i];
+        if (patch.attrs) {
+            for (const [name, value] of Object.entries(patch.attrs)) {
+                if (value === null) {
+                    node.removeAttribute(name);
+                } else {
+                    node.setAttribute(name, value);
+                }
+            }
+        }
+        if (patch.html !== undefined) {
+            node.innerHTML = patch.html;
+        }
+    });
+    return true;
+};
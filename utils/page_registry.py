@@ -0,0 +1,95 @@
+import os
+import json
+import importlib
+import threading
+from typing import Dict, Any, Callable, List, Optional
+
+class PageRegistry:
+    """Registry of application pages declared in pages/manifest.json
+
+    The manifest lists each page's name, menu label, module and factory
+    function. Page modules (and their heavy dependencies) are imported only
+    when a page is first created, not at startup.
+    """
+    
+    def __init__(self, manifest_path: str = None):
+        if manifest_path is None:
+            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            manifest_path = os.path.join(project_root, 'pages', 'manifest.json')
+        self.manifest_path = manifest_path
+        self.pages = None
+        self.default_page = None
+        self.loaded_factories = {}
+        self._lock = threading.Lock()
+    
+    def _load_manifest(self):
+        """Read the manifest once"""
+        if self.pages is not None:
+            return
+        
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        
+        pages = {}
+        for entry in manifest.get('pages', []):
+            name = entry['name']
+            pages[name] = {
+                'name': name,
+                'label': entry.get('label', name.title()),
+                # Default to the pages/<name>/<name>.py + create_<name>_page convention
+                'module': entry.get('module', f'pages.{name}.{name}'),
+                'factory': entry.get('factory', f'create_{name}_page')
+            }
+        
+        self.default_page = manifest.get('default_page') or next(iter(pages), None)
+        self.pages = pages
+    
+    def get_pages(self) -> List[Dict[str, Any]]:
+        """Get page entries in manifest order (name, label, module, factory)"""
+        self._load_manifest()
+        return list(self.pages.values())
+    
+    def get_default_page(self) -> Optional[str]:
+        """Get the name of the page shown at startup"""
+        self._load_manifest()
+        return self.default_page
+    
+    def get_page_factory(self, page_name: str) -> Optional[Callable]:
+        """Get the function that builds a page, importing its module on first use"""
+        self._load_manifest()
+        
+        factory = self.loaded_factories.get(page_name)
+        if factory is not None:
+            return factory
+        
+        entry = self.pages.get(page_name)
+        if entry is None:
+            return None
+        
+        with self._lock:
+            factory = self.loaded_factories.get(page_name)
+            if factory is None:
+                module = importlib.import_module(entry['module'])
+                factory = getattr(module, entry['factory'])
+                self.loaded_factories[page_name] = factory
+        return factory
+    
+    def is_loaded(self, page_name: str) -> bool:
+        """Check whether a page module has been imported"""
+        return page_name in self.loaded_factories
+
+# Global instance
+page_registry = PageRegistry()
+
+# Convenience functions
+def get_registered_pages() -> List[Dict[str, Any]]:
+    """Get registered page entries in menu order"""
+    return page_registry.get_pages()
+
+def get_default_page() -> Optional[str]:
+    """Get the name of the page shown at startup"""
+    return page_registry.get_default_page()
+
+def get_page_factory(page_name: str) -> Optional[Callable]:
+    """Get the function that builds a page (imported on first use)"""
+    return page_registry.get_page_factory(page_name)
@@ -0,0 +1,126 @@
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+class PageRenderCache:
+    """LRU cache of fully rendered page HTML keyed by template path and data
+
+    Callers pass the data's version (see get_page_data_version) when they
+    have one, so a lookup costs nothing in the size of the data; without a
+    version the data is fingerprinted by hashing its JSON form.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(data: Any) -> str:
+        """Return a stable hash of page data (independent of key order)"""
+        serialized = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+        return hashlib.sha1(serialized.encode('utf-8')).hexdigest()
+
+    def make_key(self, template_path: str, data: Any, version: Any = None) -> tuple:
+        """Cache key of template and data (by version when given, else by fingerprint)"""
+        if version is not None:
+            return (template_path, 'version', version)
+        return (template_path, 'fingerprint', self.fingerprint(data))
+
+    def get(self, template_path: str, data: Any, version: Any = None) -> Optional[str]:
+        """Get rendered HTML for template and data, or None on a miss"""
+        key = self.make_key(template_path, data, version)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry['html']
+
+    def put(self, template_path: str, data: Any, rendered_html: str, page_name: str = None,
+            version: Any = None):
+        """Store rendered HTML for template and data"""
+        key = self.make_key(template_path, data, version)
+        size = len(rendered_html.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = {'html': rendered_html, 'size': size, 'page_name': page_name}
+            self.total_bytes += size
+
+            # Evict least recently used entries until within limits
+            while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def invalidate_page(self, page_name: str):
+        """Remove all rendered HTML for a page"""
+        with self._lock:
+            for key in [k for k, entry in self.entries.items() if entry['page_name'] == page_name]:
+                self._remove(key)
+
+    def invalidate_template(self, template_path: str):
+        """Remove all rendered HTML for a template"""
+        with self._lock:
+            for key in [k for k in self.entries if k[0] == template_path]:
+                self._remove(key)
+
+    def clear(self):
+        """Clear all rendered HTML"""
+        with self._lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def _remove(self, key):
+        entry = self.entries.pop(key)
+        self.total_bytes -= entry['size']
+
+# Global instance
+page_render_cache = PageRenderCache()
+
+# Convenience functions
+def get_rendered_page(template_path: str, data: Any, version: Any = None) -> Optional[str]:
+    """Get cached rendered HTML for template and data (of the given data version)"""
+    return page_render_cache.get(template_path, data, version)
+
+def put_rendered_page(template_path: str, data: Any, rendered_html: str, page_name: str = None,
+                      version: Any = None):
+    """Cache rendered HTML for template and data (of the given data version)"""
+    page_render_cache.put(template_path, data, rendered_html, page_name, version)
+
+def invalidate_rendered_page(page_name: str):
+    """Remove cached rendered HTML for a page"""
+    page_render_cache.invalidate_page(page_name)
+
+def invalidate_rendered_template(template_path: str):
+    """Remove cached rendered HTML for a template"""
+    page_render_cache.invalidate_template(template_path)
+
+def get_render_cache_stats() -> Dict[str, Any]:
+    """Get rendered page cache statistics"""
+    return page_render_cache.get_stats()
@@ -1,29 +1,49 @@
 import os
 import json
-from nicegui import ui
+import weakref
+from nicegui import ui, context
+from utils.script_bundler import get_script_bundle
+from utils.script_bundle_server import get_script_url
+from utils.json_backend import load_json_file
 
 class PageScriptLoader:
-    """Utility class for loading and executing JavaScript scripts from files"""
+    """Utility class for loading and executing JavaScript scripts from files
+    
+    Scripts are served as content-hashed bundles (see utils/script_bundler.py)
+    and referenced with <script src>, so browsers cache them. Loaded bundles
+    are tracked per client: every client gets each script once, and an
+    edited script gets a new bundle that is loaded again.
+    """
     
     def __init__(self):
-        self.loaded_scripts = set()
+        self.client_scripts = weakref.WeakKeyDictionary()
     
     def load_script_from_file(self, script_path):
         """Load and execute JavaScript from a file"""
         try:
-            # Check if script was already loaded
-            if script_path in self.loaded_scripts:
-                return f"Script already loaded: {script_path}"
+            filename = get_script_bundle([script_path])
             
-            # Read script content
-            with open(script_path, 'r', encoding='utf-8') as f:
-                script_content = f.read()
+            # Check if script was already loaded by this client
+            client = context.client
+            loaded_scripts = self.client_scripts.setdefault(client, set())
+            if filename in loaded_scripts:
+                return f"Script already loaded: {script_path}"
             
-            # Inject the script into the page
-            ui.add_head_html(f"<script>{script_content}</script>")
+            # Reference the bundle from the page
+            script_url = get_script_url(filename)
+            if client.has_socket_connection:
+                ui.run_javascript(
+                    'const script = document.createElement("script");'
+                    f'script.src = "{script_url}";'
+                    # Inserted scripts are async by default - keep them in load order
+                    'script.async = false;'
+                    'document.head.appendChild(script);'
+                )
+            else:
+                ui.add_head_html(f'<script src="{script_url}"></script>')
             
             # Mark as loaded
-            self.loaded_scripts.add(script_path)
+            loaded_scripts.add(filename)
             
             return f"Script loaded successfully: {script_path}"
             
@@ -35,8 +55,7 @@ class PageScriptLoader:
     def load_json_from_file(self, json_path):
         """Load JSON data from a file"""
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_json_file(json_path)
             return data
         except FileNotFoundError:
             return {"error": f"JSON file not found: {json_path}"}
@@ -1,13 +1,89 @@
 import os
 import re
+import hashlib
+import threading
 from string import Template
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple, Callable, Optional, Set
+
+# テンプレート構文の正規表現（コンパイル時のみ使用）
+_LOOP_PATTERN = re.compile(r'{%\s*for\s+(\w+)\s+in\s+(\w+)\s*%}(.*?){%\s*endfor\s*%}', re.DOTALL)
+_CONDITIONAL_PATTERN = re.compile(r'{%\s*if\s+(\w+)\s*%}(.*?){%\s*endif\s*%}', re.DOTALL)
+_VARIABLE_PATTERN = re.compile(r'\{\{([^}]+)\}\}')
+# コンパイル中にループ部分を置き換える目印
+_LOOP_MARKER_PATTERN = re.compile(r'\x00(\d+)\x00')
+# テンプレートの継承と部分テンプレート（コンパイル前に解決）
+_EXTENDS_PATTERN = re.compile(r'^\s*{%\s*extends\s+["\']([^"\']+)["\']\s*%}')
+_BLOCK_PATTERN = re.compile(r'{%\s*block\s+(\w+)\s*%}(.*?){%\s*endblock(?:\s+\w+)?\s*%}', re.DOTALL)
+_INCLUDE_PATTERN = re.compile(r'{%\s*include\s+["\']([^"\']+)["\']\s*%}')
+
+# 共有テンプレート（レイアウト・部分テンプレート）のディレクトリ
+SHARED_TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
+
+# extends の最大階層（循環参照の検出用）
+_MAX_TEMPLATE_DEPTH = 16
+
+# 中間表現のノード種別
+_TEXT = 0
+_VARIABLE = 1
+_CONDITIONAL = 2
+_LOOP = 3
+_INCLUDE = 4
+
+
+class _Scope:
+    """ループ変数のスコープ（辞書をコピーせず親スコープに変数を重ねる）"""
+    
+    __slots__ = ('name', 'value', 'parent')
+    
+    def __init__(self, name: str, value: Any, parent: Any):
+        self.name = name
+        self.value = value
+        self.parent = parent
+
+
+def _lookup(scope: Any, name: str) -> Tuple[bool, Any]:
+    """スコープチェーンを内側から順に辿って変数を検索"""
+    while type(scope) is _Scope:
+        if scope.name == name:
+            return True, scope.value
+        scope = scope.parent
+    
+    # 最外側は元の変数辞書
+    if isinstance(scope, dict) and name in scope:
+        return True, scope[name]
+    return False, None
+
+
+class CompiledTemplate:
+    """コンパイル済みテンプレート（中間表現のノード列）"""
+    
+    def __init__(self, engine: 'PageTemplateEngine', nodes: List[Tuple], dependencies: Set[str] = None):
+        self.engine = engine
+        self.nodes = nodes
+        # 継承元・部分テンプレートのファイル（変更検知用）
+        self.dependencies = dependencies or set()
+    
+    def render(self, variables: Dict[str, Any]) -> str:
+        """コンパイル済みテンプレートを変数でレンダリング"""
+        # 出力は一つのバッファにまとめて書き込み、最後に一度だけ結合する
+        buffer = []
+        self.engine._render_nodes(self.nodes, variables, buffer.append)
+        return ''.join(buffer)
+
 
 class PageTemplateEngine:
     """シンプルなHTMLテンプレートエンジン"""
     
-    def __init__(self, templates_dir: str = "templates"):
+    # コンパイル済みテンプレートのキャッシュ（内容のハッシュ → CompiledTemplate、全インスタンスで共有）
+    _compiled_cache: Dict[str, CompiledTemplate] = {}
+    # ウォームアップのスレッドや io_bound のワーカーから同時にコンパイルされるため、参照・追加・削除はロック内で行う
+    _compiled_cache_lock = threading.Lock()
+    max_cached_templates = 128
+    
+    def __init__(self, templates_dir: str = "templates", source_filter: Optional[Callable[[str], str]] = None):
         self.templates_dir = templates_dir
+        # 継承・部分テンプレートを解決した後、コンパイル前にソースへ適用する変換（CSS抽出など）
+        self.source_filter = source_filter
     
     def load_template(self, template_name: str) -> str:
         """テンプレートファイルを読み込み"""
@@ -26,37 +102,207 @@ class PageTemplateEngine:
     
     def render_string(self, template_string: str, variables: Dict[str, Any]) -> str:
         """テンプレート文字列を変数でレンダリング"""
-        # Jinja2風の構文をサポート
-        rendered = template_string
+        # 同じ内容のテンプレートは一度だけコンパイルし、以降はキャッシュを使用
+        return self.compile_string(template_string).render(variables)
+    
+    def compile_string(self, template_string: str, base_dir: str = None) -> CompiledTemplate:
+        """テンプレート文字列をコンパイル（内容のハッシュでキャッシュ）
         
-        # {% for item in items %} ... {% endfor %} 形式のループを先に処理
-        rendered = self._process_loops(rendered, variables)
+        base_dir は extends / include の相対パスの基準ディレクトリ。
+        見つからない場合は templates_dir、共有テンプレートディレクトリの順に探す。
+        """
+        filter_name = getattr(self.source_filter, '__qualname__', '') if self.source_filter else ''
+        cache_key = hashlib.sha1(
+            f'{base_dir or ""}\x00{filter_name}\x00{template_string}'.encode('utf-8')
+        ).hexdigest()
+        with self._compiled_cache_lock:
+            compiled = self._compiled_cache.get(cache_key)
+        if compiled is None:
+            # コンパイルはロックの外で行う（部分テンプレートのコンパイルで再びここを通るため）
+            dependencies = set()
+            source = self.compose(template_string, base_dir, dependencies)
+            if self.source_filter is not None:
+                source = self.source_filter(source)
+            nodes = self._compile(source, base_dir, dependencies)
+            compiled = CompiledTemplate(self, nodes, dependencies)
+            with self._compiled_cache_lock:
+                # 同時にコンパイルされた場合は先に登録された方を使う
+                existing = self._compiled_cache.get(cache_key)
+                if existing is not None:
+                    return existing
+                while len(self._compiled_cache) >= self.max_cached_templates:
+                    # 最も古いエントリを削除
+                    self._compiled_cache.pop(next(iter(self._compiled_cache)))
+                self._compiled_cache[cache_key] = compiled
+        return compiled
+    
+    def compile_file(self, template_path: str) -> CompiledTemplate:
+        """テンプレートファイルをコンパイル（部分テンプレートは内容ごとに一度だけコンパイル）"""
+        with open(template_path, 'r', encoding='utf-8') as f:
+            template_string = f.read()
+        return self.compile_string(template_string, os.path.dirname(os.path.abspath(template_path)))
+    
+    def resolve_template_path(self, name: str, base_dir: str = None) -> str:
+        """extends / include のテンプレート名をファイルパスに解決"""
+        candidates = [base_dir, self.templates_dir, SHARED_TEMPLATES_DIR]
+        for directory in candidates:
+            if directory is None:
+                continue
+            path = os.path.abspath(os.path.join(directory, name))
+            if os.path.isfile(path):
+                return path
+        raise FileNotFoundError(f"Template file not found: {name}")
+    
+    def compose(self, template_string: str, base_dir: str = None, dependencies: Set[str] = None) -> str:
+        """{% extends %} と {% block %} を解決したテンプレート文字列を返す
         
-        # {% if condition %} ... {% endif %} 形式の条件分岐
-        rendered = self._process_conditionals(rendered, variables)
+        子テンプレートのブロックが親テンプレートの同名ブロックを置き換える。
+        ブロックの入れ子には対応しない。
+        """
+        if dependencies is None:
+            dependencies = set()
+        blocks = {}
         
-        # {{variable}} 形式の置換（ループ処理後に実行）
-        rendered = self._process_variables(rendered, variables)
+        for _ in range(_MAX_TEMPLATE_DEPTH):
+            match = _EXTENDS_PATTERN.match(template_string)
+            
+            # 子テンプレートで定義済みのブロックが優先（include は子の場所を基準に解決しておく）
+            for name, content in _BLOCK_PATTERN.findall(template_string):
+                if name not in blocks:
+                    blocks[name] = self._absolutize_includes(content, base_dir)
+            
+            if match is None:
+                return _BLOCK_PATTERN.sub(lambda m: blocks.get(m.group(1), m.group(2)), template_string)
+            
+            parent_path = self.resolve_template_path(match.group(1), base_dir)
+            dependencies.add(parent_path)
+            with open(parent_path, 'r', encoding='utf-8') as f:
+                template_string = f.read()
+            base_dir = os.path.dirname(parent_path)
         
-        return rendered
+        raise ValueError("Template inheritance is too deep (circular extends?)")
+    
+    def _absolutize_includes(self, content: str, base_dir: str) -> str:
+        """ブロック内の include を絶対パスに書き換え（親テンプレートの場所で解決されないように）"""
+        def absolutize(match):
+            try:
+                path = self.resolve_template_path(match.group(1), base_dir)
+            except FileNotFoundError:
+                return match.group(0)
+            return f'{{% include "{path}" %}}'
+        return _INCLUDE_PATTERN.sub(absolutize, content)
+    
+    def clear_compiled_cache(self):
+        """コンパイル済みテンプレートのキャッシュをクリア"""
+        with self._compiled_cache_lock:
+            self._compiled_cache.clear()
     
-    def _process_variables(self, content: str, variables: Dict[str, Any]) -> str:
-        """変数を処理（ネストしたオブジェクトプロパティも対応）"""
-        # {{variable}} または {{object.property}} 形式の置換
-        pattern = r'\{\{([^}]+)\}\}'
+    def _compile(self, template_string: str, base_dir: str = None, dependencies: Set[str] = None) -> List[Tuple]:
+        """テンプレート文字列を中間表現に変換
         
-        def replace_variable(match):
+        従来の処理順序（ループ → 条件分岐 → 変数）と同じ結果になるように、
+        同じ正規表現で一度だけ解析する。
+        """
+        # {% for item in items %} ... {% endfor %} 形式のループを先に取り出す
+        loops = []
+        
+        def extract_loop(match):
+            loops.append((_LOOP, match.group(1), match.group(2), self._compile(match.group(3), base_dir, dependencies)))
+            return f"\x00{len(loops) - 1}\x00"
+        
+        masked = _LOOP_PATTERN.sub(extract_loop, template_string)
+        
+        # {% if condition %} ... {% endif %} 形式の条件分岐
+        nodes = []
+        position = 0
+        for match in _CONDITIONAL_PATTERN.finditer(masked):
+            nodes.extend(self._compile_text(masked[position:match.start()], loops, base_dir, dependencies))
+            nodes.append((_CONDITIONAL, match.group(1), self._compile_text(match.group(2), loops, base_dir, dependencies)))
+            position = match.end()
+        nodes.extend(self._compile_text(masked[position:], loops, base_dir, dependencies))
+        
+        return nodes
+    
+    def _compile_text(self, content: str, loops: List[Tuple], base_dir: str = None,
+                      dependencies: Set[str] = None) -> List[Tuple]:
+        """テキスト部分を変数ノード・ループノード・部分テンプレートノードに分割"""
+        nodes = []
+        for index, part in enumerate(_LOOP_MARKER_PATTERN.split(content)):
+            if index % 2:
+                nodes.append(loops[int(part)])
+                continue
+            
+            # {% include "partial.html" %} 形式の部分テンプレート
+            for include_index, text in enumerate(_INCLUDE_PATTERN.split(part)):
+                if include_index % 2:
+                    nodes.append(self._compile_include(text, base_dir, dependencies))
+                else:
+                    self._compile_variables(text, nodes)
+        
+        return nodes
+    
+    def _compile_variables(self, part: str, nodes: List[Tuple]) -> None:
+        """{{variable}} 形式の変数をノードに分割"""
+        position = 0
+        for match in _VARIABLE_PATTERN.finditer(part):
+            if match.start() > position:
+                nodes.append((_TEXT, part[position:match.start()]))
             var_path = match.group(1).strip()
-            return self._get_nested_value(variables, var_path)
+            nodes.append((_VARIABLE, var_path, tuple(var_path.split('.'))))
+            position = match.end()
+        if position < len(part):
+            nodes.append((_TEXT, part[position:]))
+    
+    def _compile_include(self, name: str, base_dir: str, dependencies: Set[str]) -> Tuple:
+        """部分テンプレートノードを作成（部分テンプレートはキャッシュ済みのコンパイル結果を共有）"""
+        path = self.resolve_template_path(name, base_dir)
+        partial = self.compile_file(path)
+        if dependencies is not None:
+            dependencies.add(path)
+            dependencies.update(partial.dependencies)
+        return (_INCLUDE, partial.nodes)
+    
+    def _render_nodes(self, nodes: List[Tuple], scope: Any, write) -> None:
+        """中間表現をスコープの変数でレンダリングし、出力バッファに書き込む"""
+        for node in nodes:
+            kind = node[0]
+            if kind == _TEXT:
+                write(node[1])
+            elif kind == _VARIABLE:
+                write(self._get_nested_value(scope, node[1], node[2]))
+            elif kind == _CONDITIONAL:
+                found, value = _lookup(scope, node[1])
+                if found and value:
+                    self._render_nodes(node[2], scope, write)
+            elif kind == _INCLUDE:
+                # 部分テンプレートは呼び出し元と同じスコープでレンダリング
+                self._render_nodes(node[1], scope, write)
+            else:
+                self._render_loop(node, scope, write)
+    
+    def _render_loop(self, node: Tuple, scope: Any, write) -> None:
+        """ループノードをレンダリング"""
+        _, item_var, items_var, body = node
+        found, items = _lookup(scope, items_var)
+        if not found or not isinstance(items, (list, tuple)):
+            return
         
-        return re.sub(pattern, replace_variable, content)
+        # ループ変数用のスコープは一つだけ作成し、要素ごとに値を差し替える
+        item_scope = _Scope(item_var, None, scope)
+        for item in items:
+            item_scope.value = item
+            self._render_nodes(body, item_scope, write)
     
-    def _get_nested_value(self, variables: Dict[str, Any], var_path: str) -> str:
+    def _get_nested_value(self, scope: Any, var_path: str, parts: Tuple[str, ...] = None) -> str:
         """ネストしたオブジェクトから値を取得"""
-        parts = var_path.split('.')
-        current = variables
+        if parts is None:
+            parts = tuple(var_path.split('.'))
+        
+        found, current = _lookup(scope, parts[0])
+        if not found:
+            return f"{{{{{var_path}}}}}"
         
-        for part in parts:
+        for part in parts[1:]:
             if isinstance(current, dict) and part in current:
                 current = current[part]
             elif isinstance(current, (list, tuple)) and part.isdigit():
@@ -69,49 +315,6 @@ class PageTemplateEngine:
                 return f"{{{{{var_path}}}}}"
         
         return str(current) if current is not None else ""
-    
-    def _process_conditionals(self, content: str, variables: Dict[str, Any]) -> str:
-        """条件分岐を処理"""
-        # シンプルな実装: {% if variable %} ... {% endif %}
-        pattern = r'{%\s*if\s+(\w+)\s*%}(.*?){%\s*endif\s*%}'
-        
-        def replace_conditional(match):
-            condition_var = match.group(1)
-            conditional_content = match.group(2)
-            
-            if condition_var in variables and variables[condition_var]:
-                return conditional_content
-            return ''
-        
-        return re.sub(pattern, replace_conditional, content, flags=re.DOTALL)
-    
-    def _process_loops(self, content: str, variables: Dict[str, Any]) -> str:
-        """ループを処理"""
-        # シンプルな実装: {% for item in items %} ... {% endfor %}
-        pattern = r'{%\s*for\s+(\w+)\s+in\s+(\w+)\s*%}(.*?){%\s*endfor\s*%}'
-        
-        def replace_loop(match):
-            item_var = match.group(1)
-            items_var = match.group(2)
-            loop_content = match.group(3)
-            
-            if items_var in variables:
-                items = variables[items_var]
-                if isinstance(items, (list, tuple)):
-                    result = []
-                    for item in items:
-                        # ループ内の変数を置換
-                        item_variables = variables.copy()
-                        item_variables[item_var] = item
-                        
-                        # ループ内のコンテンツを再帰的に処理
-                        item_content = self.render_string(loop_content, item_variables)
-                        result.append(item_content)
-                    return ''.join(result)
-            
-            return ''
-        
-        return re.sub(pattern, replace_loop, content, flags=re.DOTALL)
 
 # 便利な関数
 def render_template(template_name: str, variables: Dict[str, Any], templates_dir: str = "templates") -> str:
@@ -122,4 +325,9 @@ def render_template(template_name: str, variables: Dict[str, Any], templates_dir
 def render_string(template_string: str, variables: Dict[str, Any]) -> str:
     """テンプレート文字列を簡単にレンダリングする関数"""
     engine = PageTemplateEngine()
-    return engine.render_string(template_string, variables) 
\ No newline at end of file
+    return engine.render_string(template_string, variables) 
+
+def compile_string(template_string: str, base_dir: str = None) -> CompiledTemplate:
+    """テンプレート文字列を簡単にコンパイルする関数"""
+    engine = PageTemplateEngine()
+    return engine.compile_string(template_string, base_dir)
@@ -1,33 +1,67 @@
 import os
+import json
 from nicegui import ui
-from utils.page_template_engine import render_template, render_string
+from utils.page_template_engine import render_template, render_string, PageTemplateEngine, SHARED_TEMPLATES_DIR
+from utils.file_watcher import watch_file
+from utils.page_render_cache import invalidate_rendered_template
+from utils.html_diff import diff_html
+from utils.stylesheet_bundler import extract_stylesheets, EXTRACT_STYLESHEETS
+from utils.stage_timing import stage_span
+
+# Client-side routine applying template patches (loaded with each page template)
+PATCH_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'page_patch.js')
+
+# Send the full content instead when the patches are at least this large relative to it
+MAX_PATCH_RATIO = 0.5
 
 class PageTemplateLoader:
     """Utility class for loading HTML templates from files"""
     
     def __init__(self):
         self.loaded_templates = {}
+        self.compiled_templates = {}
+        # Layouts and partials -> templates built from them
+        self.template_dependencies = {}
+        # Static CSS is served as cached stylesheets instead of inline <style> blocks
+        self.engine = PageTemplateEngine(
+            SHARED_TEMPLATES_DIR,
+            source_filter=extract_stylesheets if EXTRACT_STYLESHEETS else None
+        )
+    
+    def render_template_file(self, template_path, variables=None):
+        """Read (cached) template file and render it to an HTML string without touching the UI"""
+        # Check if template was already loaded
+        if template_path in self.loaded_templates:
+            template_content = self.loaded_templates[template_path]
+        else:
+            # Read template content
+            with open(template_path, 'r', encoding='utf-8') as f:
+                template_content = f.read()
+            self.loaded_templates[template_path] = template_content
+            # Drop the cached template when the file is edited
+            watch_file(template_path, self.invalidate_template)
+        
+        # Render template with variables (compiled once per template, with its layout and partials)
+        compiled_template = self.compiled_templates.get(template_path)
+        if compiled_template is None:
+            compiled_template = self.engine.compile_string(
+                template_content, os.path.dirname(os.path.abspath(template_path))
+            )
+            self.compiled_templates[template_path] = compiled_template
+            for dependency in compiled_template.dependencies:
+                self.template_dependencies.setdefault(dependency, set()).add(template_path)
+                watch_file(dependency, self._on_dependency_changed)
+        return compiled_template.render(variables or {})
     
     def load_template_from_file(self, template_path, variables=None):
         """Load HTML template from file and render with variables"""
         try:
-            # Check if template was already loaded
-            if template_path in self.loaded_templates:
-                template_content = self.loaded_templates[template_path]
-            else:
-                # Read template content
-                with open(template_path, 'r', encoding='utf-8') as f:
-                    template_content = f.read()
-                self.loaded_templates[template_path] = template_content
-            
-            # Render template with variables
-            if variables:
-                rendered_html = render_string(template_content, variables)
-            else:
-                rendered_html = template_content
+            with stage_span('template_render'):
+                rendered_html = self.render_template_file(template_path, variables)
             
             # Inject the HTML into NiceGUI
-            html_container = ui.html(rendered_html).style('width: 100%;')
+            with stage_span('html_inject'):
+                html_container = ui.html(rendered_html).style('width: 100%;')
             return html_container
             
         except FileNotFoundError:
@@ -37,6 +71,51 @@ class PageTemplateLoader:
             ui.label(f'❌ Error loading template: {str(e)}').classes('text-h6 text-red')
             return None
     
+    async def update_template(self, html_container, template_path, variables=None):
+        """Re-render a loaded template and send only the changed elements
+        
+        The previous output is the container's current content, which is
+        kept per client. Patches from utils/html_diff.py are applied by
+        page_patch.js; the full content is sent when the change is too large
+        or the client's DOM does not match. Returns the bytes sent.
+        """
+        rendered_html = self.render_template_file(template_path, variables)
+        previous_html = html_container._props.get('innerHTML', '')
+        if rendered_html == previous_html:
+            return 0
+        
+        # Keep the server-side content current without sending it
+        html_container._props['innerHTML'] = rendered_html
+        
+        patches = diff_html(previous_html, rendered_html)
+        if patches is not None:
+            payload = json.dumps(patches, ensure_ascii=False)
+            if len(payload) < len(rendered_html) * MAX_PATCH_RATIO:
+                try:
+                    applied = await html_container.client.run_javascript(
+                        f'window.myappApplyPatches ? window.myappApplyPatches("c{html_container.id}", {payload}) : false'
+                    )
+                except Exception:
+                    applied = False
+                if applied:
+                    return len(payload.encode('utf-8'))
+        
+        # Send the whole content
+        html_container.update()
+        return len(rendered_html.encode('utf-8'))
+    
+    def invalidate_template(self, template_path):
+        """Remove a template from the cache so it is read again on next load"""
+        self.loaded_templates.pop(template_path, None)
+        self.compiled_templates.pop(template_path, None)
+        invalidate_rendered_template(template_path)
+    
+    def _on_dependency_changed(self, dependency_path):
+        """File watch callback - a layout or partial changed, recompile the templates using it"""
+        self.engine.clear_compiled_cache()
+        for template_path in self.template_dependencies.pop(dependency_path, set()):
+            self.invalidate_template(template_path)
+    
     def get_template_content(self, template_path):
         """Get template content without rendering"""
         try:
@@ -55,7 +134,8 @@ class PageTemplateLoader:
             else:
                 rendered_html = template_string
             
-            html_container = ui.html(rendered_html).style('width: 100%;')
+            with stage_span('html_inject'):
+                html_container = ui.html(rendered_html).style('width: 100%;')
             return html_container
             
         except Exception as e:
@@ -70,6 +150,14 @@ def load_template(template_path, variables=None):
     """Load and render HTML template from file"""
     return page_template_loader.load_template_from_file(template_path, variables)
 
+async def update_template(html_container, template_path, variables=None):
+    """Re-render a loaded template, sending only the changed elements"""
+    return await page_template_loader.update_template(html_container, template_path, variables)
+
+def render_template_file(template_path, variables=None):
+    """Render HTML template file to a string"""
+    return page_template_loader.render_template_file(template_path, variables)
+
 def get_template_content(template_path):
     """Get template content without rendering"""
     return page_template_loader.get_template_content(template_path)
@@ -0,0 +1,263 @@
+import os
+import time
+import hashlib
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any
+
+# Measure websocket messages sent to the browser (MYAPP_PAYLOAD_METRICS=1 enables);
+# every message is serialized once more to be measured, so it is off by default
+PAYLOAD_METRICS = os.environ.get('MYAPP_PAYLOAD_METRICS', '0') == '1'
+
+# Upper bounds (bytes) of the payload histogram buckets
+PAYLOAD_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Messages sent this long after an action finished still belong to it (seconds);
+# NiceGUI sends element updates from its outbox loop shortly after the handler returns
+ATTRIBUTION_WINDOW = 0.25
+
+# Clients with per-client totals kept (least recently active are dropped)
+MAX_CLIENTS = 100
+
+# Action for messages sent outside a tracked action (timers, bindings, ...)
+OTHER_ACTION = 'other'
+
+# Hex digits of the client id hash shown in statistics
+CLIENT_LABEL_LENGTH = 8
+
+# Message types counted as their own action wherever they are sent
+MESSAGE_ACTIONS = {'notify': 'notify'}
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket bounds (Prometheus style)"""
+
+    __slots__ = ('bounds', 'counts', 'count', 'sum', 'max')
+
+    def __init__(self, bounds=PAYLOAD_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+
+    def observe(self, value):
+        """Add one observation"""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Count, sum, max and cumulative bucket counts ('le' of the last bucket is '+Inf')"""
+        buckets = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + ('+Inf',), self.counts):
+            cumulative += count
+            buckets.append({'le': bound, 'count': cumulative})
+        return {'count': self.count, 'sum': self.sum, 'max': self.max, 'buckets': buckets}
+
+
+def measure_payload(data: Any) -> int:
+    """Size in bytes of data serialized the way NiceGUI sends it over the websocket"""
+    try:
+        from nicegui import json as nicegui_json
+        return len(nicegui_json.dumps(data).encode('utf-8'))
+    except Exception:
+        return len(str(data).encode('utf-8'))
+
+
+def client_label(client_id: str) -> str:
+    """Short hash of a client id - statistics never expose the id itself"""
+    return hashlib.sha256(client_id.encode('utf-8')).hexdigest()[:CLIENT_LABEL_LENGTH]
+
+
+class PayloadMeter:
+    """Counts bytes and messages sent to each browser client, per action
+
+    An action (page switch, chart render, ...) is tracked with track() in
+    the handler that performs it. Every websocket message to that client
+    until shortly after the handler returns is attributed to it; 'notify'
+    messages always count as the 'notify' action. Per action the meter
+    keeps a histogram of message sizes, a histogram of the total bytes of
+    each action and totals per message type. Per client it keeps totals
+    per action, reported under a short hash of the client id.
+    """
+
+    def __init__(self, enabled: bool = False, window: float = ATTRIBUTION_WINDOW,
+                 max_clients: int = MAX_CLIENTS):
+        self.enabled = enabled
+        self.window = window
+        self.max_clients = max_clients
+        self.actions = {}
+        self.clients = OrderedDict()
+        self.current = {}
+        self.installed = False
+        self._lock = threading.Lock()
+
+    def install(self):
+        """Measure every message NiceGUI emits through its socket.io server"""
+        if not self.enabled or self.installed:
+            return
+        from nicegui import core
+        emit = core.sio.emit
+
+        async def measured_emit(event, data=None, *args, **kwargs):
+            target = kwargs.get('room', kwargs.get('to'))
+            if isinstance(target, str):
+                self.record(target, event, data)
+            return await emit(event, data, *args, **kwargs)
+
+        core.sio.emit = measured_emit
+        self.installed = True
+
+    def _action_stats(self, action: str) -> Dict[str, Any]:
+        """Statistics of an action (caller holds the lock)"""
+        stats = self.actions.get(action)
+        if stats is None:
+            stats = {
+                'invocations': 0,
+                'messages': 0,
+                'bytes': 0,
+                'message_bytes': Histogram(),
+                'action_bytes': Histogram(),
+                'message_types': {}
+            }
+            self.actions[action] = stats
+        return stats
+
+    def _finish(self, client_id: str):
+        """Record the total of the client's current action (caller holds the lock)"""
+        current = self.current.pop(client_id, None)
+        if current is not None:
+            self._action_stats(current['action'])['action_bytes'].observe(current['bytes'])
+
+    def _finish_expired(self, now: float):
+        """Record the totals of actions whose attribution window has passed (caller holds the lock)"""
+        for client_id, current in list(self.current.items()):
+            if current['expires'] is not None and current['expires'] < now:
+                self._finish(client_id)
+
+    def start_action(self, client_id: str, action: str):
+        """Attribute the client's messages to action from now on"""
+        with self._lock:
+            self._finish(client_id)
+            self._action_stats(action)['invocations'] += 1
+            self.current[client_id] = {'action': action, 'bytes': 0, 'expires': None}
+
+    def end_action(self, client_id: str, action: str):
+        """Keep attributing messages to action for the attribution window, then stop"""
+        with self._lock:
+            current = self.current.get(client_id)
+            if current is not None and current['action'] == action:
+                current['expires'] = time.monotonic() + self.window
+
+    @contextmanager
+    def track(self, action: str):
+        """Attribute the current client's messages to action while the block runs"""
+        if not self.enabled:
+            yield
+            return
+        from nicegui import context
+        client_id = context.client.id
+        self.start_action(client_id, action)
+        try:
+            yield
+        finally:
+            self.end_action(client_id, action)
+
+    def record(self, client_id: str, message_type: str, data: Any):
+        """Count one message sent to a client"""
+        size = measure_payload(data)
+        now = time.monotonic()
+        with self._lock:
+            current = self.current.get(client_id)
+            if current is not None and current['expires'] is not None and current['expires'] < now:
+                self._finish(client_id)
+                current = None
+
+            action = MESSAGE_ACTIONS.get(message_type)
+            if action is not None:
+                # Each such message is one invocation of its action
+                stats = self._action_stats(action)
+                stats['invocations'] += 1
+                stats['action_bytes'].observe(size)
+            elif current is not None:
+                action = current['action']
+                current['bytes'] += size
+            else:
+                action = OTHER_ACTION
+
+            stats = self._action_stats(action)
+            stats['messages'] += 1
+            stats['bytes'] += size
+            stats['message_bytes'].observe(size)
+            by_type = stats['message_types'].setdefault(message_type, {'messages': 0, 'bytes': 0})
+            by_type['messages'] += 1
+            by_type['bytes'] += size
+
+            client = self.clients.pop(client_id, None) or {}
+            self.clients[client_id] = client
+            totals = client.setdefault(action, {'messages': 0, 'bytes': 0})
+            totals['messages'] += 1
+            totals['bytes'] += size
+            while len(self.clients) > self.max_clients:
+                self.clients.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-action and per-client statistics"""
+        with self._lock:
+            self._finish_expired(time.monotonic())
+            actions = {
+                action: {
+                    'invocations': stats['invocations'],
+                    'messages': stats['messages'],
+                    'bytes': stats['bytes'],
+                    'message_bytes': stats['message_bytes'].to_dict(),
+                    'action_bytes': stats['action_bytes'].to_dict(),
+                    'message_types': {name: dict(totals) for name, totals in stats['message_types'].items()}
+                }
+                for action, stats in self.actions.items()
+            }
+            clients = {
+                client_label(client_id): {action: dict(totals) for action, totals in client.items()}
+                for client_id, client in self.clients.items()
+            }
+        return {
+            'enabled': self.enabled,
+            'installed': self.installed,
+            'attribution_window': self.window,
+            'actions': actions,
+            'clients': clients
+        }
+
+    def reset(self):
+        """Forget all statistics"""
+        with self._lock:
+            self.actions.clear()
+            self.clients.clear()
+            self.current.clear()
+
+
+# Global instance
+payload_meter = PayloadMeter(enabled=PAYLOAD_METRICS)
+
+# Convenience functions
+def install_payload_metrics():
+    """Start measuring websocket messages"""
+    payload_meter.install()
+
+def track_payload(action: str):
+    """Context manager attributing the current client's messages to action"""
+    return payload_meter.track(action)
+
+def get_payload_stats() -> Dict[str, Any]:
+    """Get websocket payload statistics"""
+    return payload_meter.get_stats()
+
+def reset_payload_stats():
+    """Forget websocket payload statistics"""
+    payload_meter.reset()
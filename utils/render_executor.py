@@ -0,0 +1,141 @@
+import os
+import asyncio
+from typing import Any, Callable, Dict
+from nicegui import run
+
+
+class RenderQueueFullError(Exception):
+    """Raised when too many render jobs are already waiting"""
+
+
+class RenderExecutor:
+    """Run CPU-heavy render jobs off the NiceGUI event loop
+
+    Jobs run in NiceGUI's process pool (mode='process') or thread pool
+    (mode='thread'). At most max_concurrent jobs run at once, at most
+    max_queued jobs wait for a slot, and each job is given timeout seconds.
+    A timed out job is abandoned by the caller, but a running worker cannot
+    be interrupted: the job keeps its slot until the worker finishes it, so
+    timeouts never let more than max_concurrent jobs run. Low-priority jobs
+    (submit_idle) wait until no other job runs or waits.
+    """
+
+    def __init__(self, mode: str = 'process', max_concurrent: int = 2,
+                 max_queued: int = 32, timeout: float = 30.0):
+        if mode not in ('process', 'thread'):
+            raise ValueError(f"Unknown render executor mode: {mode}")
+        self.mode = mode
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def submit(self, func: Callable, *args, **kwargs) -> Any:
+        """Run func(*args, **kwargs) in the pool and return its result
+
+        func and its arguments must be picklable in process mode.
+        """
+        if self.queued >= self.max_queued:
+            self.rejected += 1
+            raise RenderQueueFullError(f"Render queue is full ({self.queued} jobs waiting)")
+
+        self.queued += 1
+        self._idle.clear()
+        try:
+            await self._semaphore.acquire()
+        except BaseException:
+            self.queued -= 1
+            # A cancelled wait may leave the executor idle
+            self._is_idle()
+            raise
+        self.queued -= 1
+
+        self.running += 1
+        self._idle.clear()
+        try:
+            if self.mode == 'process':
+                job = run.cpu_bound(func, *args, **kwargs)
+            else:
+                job = run.io_bound(func, *args, **kwargs)
+            # The job runs as its own task so a timeout does not cancel it
+            task = asyncio.ensure_future(job)
+        except BaseException:
+            self._release_slot(None)
+            raise
+        task.add_done_callback(self._release_slot)
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(task), timeout=self.timeout)
+            self.completed += 1
+            return result
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+
+    async def submit_idle(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a low-priority job (e.g. a warm-up render) once the executor is idle"""
+        while not self._is_idle():
+            await self._idle.wait()
+        return await self.submit(func, *args, **kwargs)
+
+    def _is_idle(self) -> bool:
+        """Check whether no job runs or waits (and remember it for submit_idle)"""
+        if self.running == 0 and self.queued == 0:
+            self._idle.set()
+            return True
+        self._idle.clear()
+        return False
+
+    def _release_slot(self, task):
+        """Free a worker slot once its job has really finished"""
+        self.running -= 1
+        self._semaphore.release()
+        self._is_idle()
+        # Mark the exception of an abandoned job as retrieved
+        if task is not None and not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and job counters"""
+        return {
+            'mode': self.mode,
+            'max_concurrent': self.max_concurrent,
+            'queued': self.queued,
+            'running': self.running,
+            'completed': self.completed,
+            'failed': self.failed,
+            'timed_out': self.timed_out,
+            'rejected': self.rejected
+        }
+
+# Global instance (configurable through environment variables)
+render_executor = RenderExecutor(
+    mode=os.environ.get('MYAPP_RENDER_MODE', 'process'),
+    max_concurrent=int(os.environ.get('MYAPP_RENDER_WORKERS', '2')),
+    max_queued=int(os.environ.get('MYAPP_RENDER_QUEUE', '32')),
+    timeout=float(os.environ.get('MYAPP_RENDER_TIMEOUT', '30'))
+)
+
+# Convenience functions
+async def run_render_job(func: Callable, *args, **kwargs) -> Any:
+    """Run a render job off the event loop"""
+    return await render_executor.submit(func, *args, **kwargs)
+
+async def run_idle_render_job(func: Callable, *args, **kwargs) -> Any:
+    """Run a low-priority render job once no other render job runs or waits"""
+    return await render_executor.submit_idle(func, *args, **kwargs)
+
+def get_render_queue_stats() -> Dict[str, Any]:
+    """Get render queue depth and job counters"""
+    return render_executor.get_stats()
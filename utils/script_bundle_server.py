@@ -0,0 +1,40 @@
+import re
+from fastapi import Request
+from fastapi.responses import Response
+from nicegui import app
+from utils.script_bundler import get_bundle_file
+from utils.http_cache import etag_matches
+
+SCRIPT_ROUTE = '/scripts'
+
+# Bundle file names contain their content hash, so a URL never changes its script
+SCRIPT_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_BUNDLE_FILE_PATTERN = re.compile(r'^[A-Za-z0-9_-]+\.[0-9a-f]+\.js$')
+
+
+def get_script_url(filename: str) -> str:
+    """Get the URL serving a script bundle"""
+    return f'{SCRIPT_ROUTE}/{filename}'
+
+
+@app.get(SCRIPT_ROUTE + '/{filename}')
+def serve_script_bundle(filename: str, request: Request):
+    """Serve a script bundle with ETag support"""
+    if not _BUNDLE_FILE_PATTERN.match(filename):
+        return Response(status_code=404)
+
+    etag = f'"{filename.rsplit(".", 2)[1]}"'
+    headers = {'ETag': etag, 'Cache-Control': SCRIPT_CACHE_CONTROL}
+
+    # Unknown names are 404 even when the browser sends a matching ETag
+    content = get_bundle_file(filename)
+    if content is None:
+        return Response(status_code=404)
+
+    # Conditional GET - the browser already has this bundle
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=content, media_type='text/javascript', headers=headers)
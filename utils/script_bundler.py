@@ -0,0 +1,150 @@
+import os
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from utils.file_watcher import watch_file
+
+# Minify bundles (MYAPP_MINIFY_JS=1); uses rjsmin when installed
+MINIFY_SCRIPTS = os.environ.get('MYAPP_MINIFY_JS', '0') == '1'
+
+# Hex digits of the content hash used in bundle file names
+HASH_LENGTH = 16
+
+# Replaced bundle files kept for clients that still reference them (oldest are dropped)
+MAX_PREVIOUS_FILES = 16
+
+_BUNDLE_NAME_PATTERN = re.compile(r'[^A-Za-z0-9_-]+')
+
+
+def minify_script(source: str) -> str:
+    """Minify JavaScript
+
+    Uses rjsmin when installed. Otherwise a conservative line-based pass
+    drops indentation, blank lines and whole-line // comments, leaving
+    template literals untouched.
+    """
+    try:
+        import rjsmin
+        return rjsmin.jsmin(source)
+    except ImportError:
+        pass
+
+    lines = []
+    in_template = False
+    for line in source.splitlines():
+        if in_template:
+            lines.append(line)
+        else:
+            stripped = line.strip()
+            if stripped and not stripped.startswith('//'):
+                lines.append(stripped)
+        # An odd number of backticks opens or closes a template literal
+        if line.count('`') % 2:
+            in_template = not in_template
+    return '\n'.join(lines) + '\n'
+
+
+class ScriptBundler:
+    """Bundles JavaScript files into content-hashed files
+
+    A bundle is the concatenation of its source files (optionally
+    minified) and is named <name>.<hash>.js after its content, so a URL
+    never changes its content and browsers can cache it forever. Bundles
+    are rebuilt when a source file changes; the last max_previous_files
+    replaced versions stay available for clients that still reference
+    them.
+    """
+
+    def __init__(self, minify: bool = False, max_previous_files: int = MAX_PREVIOUS_FILES):
+        self.minify = minify
+        self.max_previous_files = max_previous_files
+        self.bundles = {}
+        self.files = {}
+        self.previous_files = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def bundle_name(script_paths: List[str]) -> str:
+        """Derive a bundle name from its first source file"""
+        base_name = os.path.splitext(os.path.basename(script_paths[0]))[0]
+        return _BUNDLE_NAME_PATTERN.sub('_', base_name) or 'bundle'
+
+    def get_bundle(self, script_paths: List[str], name: str = None) -> str:
+        """Build (or reuse) the bundle of script_paths and return its file name"""
+        key = tuple(os.path.abspath(path) for path in script_paths)
+        with self._lock:
+            filename = self.bundles.get(key)
+            if filename is not None:
+                return filename
+
+        parts = []
+        for path in key:
+            with open(path, 'r', encoding='utf-8') as f:
+                parts.append(f'/* {os.path.basename(path)} */\n{f.read()}')
+        source = ';\n'.join(parts)
+        if self.minify:
+            source = minify_script(source)
+
+        content = source.encode('utf-8')
+        digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+        filename = f'{name or self.bundle_name(script_paths)}.{digest}.js'
+
+        with self._lock:
+            self.previous_files.pop(filename, None)
+            self.files[filename] = content
+            self.bundles[key] = filename
+
+        # Rebuild the bundle when a source file is edited
+        for path in key:
+            watch_file(path, self.invalidate_script)
+        return filename
+
+    def get_file(self, filename: str) -> Optional[bytes]:
+        """Get the content of a bundle file"""
+        with self._lock:
+            content = self.files.get(filename)
+            if content is None:
+                content = self.previous_files.get(filename)
+            return content
+
+    def invalidate_script(self, script_path: str):
+        """Drop bundles built from script_path so they are rebuilt on next use"""
+        abs_path = os.path.abspath(script_path)
+        with self._lock:
+            for key in [key for key in self.bundles if abs_path in key]:
+                filename = self.bundles.pop(key)
+                # Another bundle may still be built from the same content
+                if filename not in self.bundles.values():
+                    self.previous_files[filename] = self.files.pop(filename)
+            while len(self.previous_files) > self.max_previous_files:
+                self.previous_files.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get bundle statistics"""
+        with self._lock:
+            return {
+                'bundles': len(self.bundles),
+                'files': len(self.files),
+                'previous_files': len(self.previous_files),
+                'bytes': sum(len(content) for content in self.files.values())
+                         + sum(len(content) for content in self.previous_files.values())
+            }
+
+
+# Global instance
+script_bundler = ScriptBundler(minify=MINIFY_SCRIPTS)
+
+# Convenience functions
+def get_script_bundle(script_paths: List[str], name: str = None) -> str:
+    """Get the file name of the bundle of script_paths"""
+    return script_bundler.get_bundle(script_paths, name)
+
+def get_bundle_file(filename: str) -> Optional[bytes]:
+    """Get the content of a bundle file"""
+    return script_bundler.get_file(filename)
+
+def get_bundle_stats():
+    """Get bundle statistics"""
+    return script_bundler.get_stats()
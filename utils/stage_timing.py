@@ -0,0 +1,179 @@
+import os
+import time
+import inspect
+import threading
+import functools
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Dict, Any, Callable, List, Optional
+from utils.payload_metrics import Histogram
+
+# Time page building stages (MYAPP_STAGE_TIMING=0 disables)
+STAGE_TIMING = os.environ.get('MYAPP_STAGE_TIMING', '1') != '0'
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Page label of spans outside a page
+UNKNOWN_PAGE = 'unknown'
+
+# Page whose stages are being timed (set by StageTimer.page)
+_current_page: ContextVar[Optional[str]] = ContextVar('myapp_current_page', default=None)
+
+# Returned by span() when timing is disabled - entering it costs next to nothing
+_NULL_SPAN = nullcontext()
+
+
+class _Span:
+    """Times one stage and records it on exit (also when the stage raises)"""
+
+    __slots__ = ('timer', 'stage', 'page', 'start')
+
+    def __init__(self, timer: 'StageTimer', stage: str, page: Optional[str]):
+        self.timer = timer
+        self.stage = stage
+        self.page = page
+
+    def __enter__(self):
+        if self.page is None:
+            self.page = _current_page.get() or UNKNOWN_PAGE
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer.observe(self.page, self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class _PageSpan(_Span):
+    """Times a whole page build as stage 'total' and labels the spans inside it"""
+
+    __slots__ = ('token',)
+
+    def __enter__(self):
+        self.token = _current_page.set(self.page)
+        return super().__enter__()
+
+    def __exit__(self, *exc_info):
+        _current_page.reset(self.token)
+        return super().__exit__(*exc_info)
+
+
+class StageTimer:
+    """Aggregates stage latencies per page into histograms
+
+    Stages are timed with span() (a context manager) or timed() (a
+    decorator for functions and coroutines). Spans inside a page() block
+    are labelled with that page. When disabled, span() returns a shared
+    no-op context manager and timed() returns the function unchanged, so
+    instrumented code pays one attribute check per stage.
+    """
+
+    def __init__(self, enabled: bool = True, buckets=LATENCY_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def span(self, stage: str, page: str = None):
+        """Context manager timing a stage (of page, or of the enclosing page() block)"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage, page)
+
+    def page(self, page_name: str):
+        """Context manager timing a page build; spans inside it belong to page_name"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _PageSpan(self, 'total', page_name)
+
+    def timed(self, stage: str, page: str = None) -> Callable[[Callable], Callable]:
+        """Decorator timing every call of a function or coroutine function as a stage"""
+        def decorator(func):
+            if not self.enabled:
+                return func
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with _Span(self, stage, page):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with _Span(self, stage, page):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def observe(self, page: str, stage: str, seconds: float):
+        """Record one stage duration"""
+        key = (page, stage)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = Histogram(self.buckets)
+                self.histograms[key] = histogram
+            histogram.observe(seconds)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Get the histogram of every (page, stage) pair"""
+        with self._lock:
+            return [
+                dict(page=page, stage=stage, **histogram.to_dict())
+                for (page, stage), histogram in sorted(self.histograms.items())
+            ]
+
+    def reset(self):
+        """Forget all timings"""
+        with self._lock:
+            self.histograms.clear()
+
+
+def format_prometheus_histogram(name: str, help_text: str, series: List[Dict[str, Any]],
+                                label_names: List[str]) -> str:
+    """Format histograms (Histogram.to_dict() plus label values) in Prometheus text format"""
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+    for histogram in series:
+        labels = ','.join(f'{label}="{_escape_label(histogram[label])}"' for label in label_names)
+        for bucket in histogram['buckets']:
+            le = bucket['le'] if bucket['le'] == '+Inf' else repr(float(bucket['le']))
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {bucket["count"]}')
+        lines.append(f'{name}_sum{{{labels}}} {histogram["sum"]}')
+        lines.append(f'{name}_count{{{labels}}} {histogram["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value: Any) -> str:
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Global instance
+stage_timer = StageTimer(enabled=STAGE_TIMING)
+
+# Convenience functions
+def stage_span(stage: str, page: str = None):
+    """Context manager timing a stage"""
+    return stage_timer.span(stage, page)
+
+def page_timing(page_name: str):
+    """Context manager timing a page build and labelling the stages inside it"""
+    return stage_timer.page(page_name)
+
+def timed_stage(stage: str, page: str = None):
+    """Decorator timing every call of a function as a stage"""
+    return stage_timer.timed(stage, page)
+
+def get_stage_stats() -> List[Dict[str, Any]]:
+    """Get stage latency histograms"""
+    return stage_timer.get_stats()
+
+def get_stage_metrics() -> str:
+    """Get stage latency histograms in Prometheus text format"""
+    return format_prometheus_histogram(
+        'myapp_page_stage_seconds',
+        'Duration of page building and chart stages in seconds',
+        stage_timer.get_stats(),
+        ['page', 'stage']
+    )
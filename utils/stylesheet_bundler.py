@@ -0,0 +1,121 @@
+import os
+import re
+import sys
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Move static <style> blocks of page templates into cached stylesheets (MYAPP_EXTRACT_CSS=0 disables)
+EXTRACT_STYLESHEETS = os.environ.get('MYAPP_EXTRACT_CSS', '1') != '0'
+
+# Must match utils/stylesheet_server.STYLESHEET_ROUTE (kept here so this module has no web imports)
+STYLESHEET_ROUTE = '/styles'
+
+# Hex digits of the content hash used in stylesheet file names
+HASH_LENGTH = 16
+
+# Stylesheets kept (least recently used are dropped); twice the compiled template
+# cache of PageTemplateEngine, so every cached template's CSS stays available
+MAX_STYLESHEETS = 256
+
+_STYLE_PATTERN = re.compile(r'<style(\s[^>]*)?>(.*?)</style\s*>', re.DOTALL | re.IGNORECASE)
+
+
+class StylesheetBundler:
+    """Content-hashed stylesheets extracted from page templates
+
+    extract() replaces every <style> block that contains no template
+    syntax with a <link> to /styles/<hash>.css, so the CSS is downloaded
+    once and cached by the browser instead of being sent inside every
+    rendered page. Identical CSS (e.g. from a shared base template) maps
+    to the same file for every page. CSS of edited templates is dropped
+    once more than max_files stylesheets are kept.
+    """
+
+    def __init__(self, max_files: int = MAX_STYLESHEETS):
+        self.max_files = max_files
+        self.files = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, css: str) -> str:
+        """Store CSS and return its file name"""
+        content = css.strip().encode('utf-8')
+        filename = f'{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}.css'
+        with self._lock:
+            self.files[filename] = content
+            self.files.move_to_end(filename)
+            while len(self.files) > self.max_files:
+                self.files.popitem(last=False)
+        return filename
+
+    def extract(self, source: str) -> str:
+        """Replace static <style> blocks in template source with stylesheet links"""
+        def replace(match):
+            attributes, css = match.group(1) or '', match.group(2)
+            # Styles built from template variables stay inline
+            if '{{' in css or '{%' in css or not css.strip():
+                return match.group(0)
+            filename = self.add(css)
+            return f'<link rel="stylesheet" href="{STYLESHEET_ROUTE}/{filename}"{attributes}>'
+        return _STYLE_PATTERN.sub(replace, source)
+
+    def get_file(self, filename: str) -> Optional[bytes]:
+        """Get the content of a stylesheet file"""
+        with self._lock:
+            content = self.files.get(filename)
+            if content is not None:
+                self.files.move_to_end(filename)
+            return content
+
+    def write_files(self, output_dir: str) -> Dict[str, int]:
+        """Write all stylesheets to output_dir (for serving from a CDN or reverse proxy)"""
+        os.makedirs(output_dir, exist_ok=True)
+        with self._lock:
+            files = dict(self.files)
+        for filename, content in files.items():
+            with open(os.path.join(output_dir, filename), 'wb') as f:
+                f.write(content)
+        return {filename: len(content) for filename, content in files.items()}
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get stylesheet statistics"""
+        with self._lock:
+            return {'files': len(self.files), 'bytes': sum(len(content) for content in self.files.values())}
+
+
+# Global instance
+stylesheet_bundler = StylesheetBundler()
+
+# Convenience functions
+def extract_stylesheets(source: str) -> str:
+    """Replace static <style> blocks with links to cached stylesheets"""
+    return stylesheet_bundler.extract(source)
+
+def get_stylesheet_file(filename: str) -> Optional[bytes]:
+    """Get the content of a stylesheet file"""
+    return stylesheet_bundler.get_file(filename)
+
+def get_stylesheet_stats():
+    """Get stylesheet statistics"""
+    return stylesheet_bundler.get_stats()
+
+
+def build_stylesheets(output_dir: str) -> Dict[str, int]:
+    """Build step: extract the CSS of every registered page template into output_dir"""
+    from utils.page_registry import get_registered_pages
+    from utils.page_template_engine import PageTemplateEngine
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    engine = PageTemplateEngine(source_filter=extract_stylesheets)
+    for page in get_registered_pages():
+        name = page['name']
+        engine.compile_file(os.path.join(project_root, 'pages', name, f'{name}_template.html'))
+    return stylesheet_bundler.write_files(output_dir)
+
+
+if __name__ == '__main__':
+    # python -m utils.stylesheet_bundler [output_dir]
+    output = sys.argv[1] if len(sys.argv) > 1 else os.path.join('static', 'styles')
+    for filename, size in build_stylesheets(output).items():
+        print(f'{filename}  {size} bytes')
@@ -0,0 +1,33 @@
+import re
+from fastapi import Request
+from fastapi.responses import Response
+from nicegui import app
+from utils.stylesheet_bundler import get_stylesheet_file, STYLESHEET_ROUTE
+from utils.http_cache import etag_matches
+
+# Stylesheet file names are content hashes, so a URL never changes its CSS
+STYLESHEET_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_STYLESHEET_FILE_PATTERN = re.compile(r'^[0-9a-f]+\.css$')
+
+
+@app.get(STYLESHEET_ROUTE + '/{filename}')
+def serve_stylesheet(filename: str, request: Request):
+    """Serve an extracted stylesheet with ETag support"""
+    if not _STYLESHEET_FILE_PATTERN.match(filename):
+        return Response(status_code=404)
+
+    etag = f'"{filename[:-len(".css")]}"'
+    headers = {'ETag': etag, 'Cache-Control': STYLESHEET_CACHE_CONTROL}
+
+    # Unknown names are 404 even when the browser sends a matching ETag
+    content = get_stylesheet_file(filename)
+    if content is None:
+        return Response(status_code=404)
+
+    # Conditional GET - the browser already has this stylesheet
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=content, media_type='text/css', headers=headers)
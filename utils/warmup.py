@@ -0,0 +1,168 @@
+import os
+import time
+import importlib
+import threading
+from typing import Dict, Any, List
+from nicegui import background_tasks, run
+
+from utils.page_registry import get_registered_pages
+from utils.page_data_loader import load_page_data, get_page_data_version
+from utils.page_template_loader import render_template_file, PATCH_SCRIPT
+from utils.script_bundler import get_script_bundle
+from utils.page_render_cache import put_rendered_page
+
+# Project root (utils/ -> project root)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class WarmupRunner:
+    """Background warm-up of page templates, page data and sample charts
+
+    Started once after the first client connects, so it never delays the
+    first paint. Page modules are imported, page data is loaded, every
+    template is rendered into the page render cache and the page's script
+    bundles are built on a worker thread; the chart page's sample and quick
+    charts are then rendered into the chart image cache as low-priority
+    render jobs, which wait while real renders run. Progress is available
+    from get_progress().
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started = False
+        self.done = False
+        self.total = 0
+        self.completed = 0
+        self.current = None
+        self.errors = []
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start warming up in the background (only the first call has an effect)"""
+        with self._lock:
+            if not self.enabled or self.started:
+                return
+            self.started = True
+        background_tasks.create(self.run(), name='warmup')
+
+    async def run(self):
+        """Warm up every registered page, then the chart samples"""
+        self.started_at = time.perf_counter()
+        pages = get_registered_pages()
+        charts = []
+        self.total = len(pages)
+
+        for page in pages:
+            self.current = page['name']
+            try:
+                charts.extend(await run.io_bound(self.warm_page, page))
+            except Exception as e:
+                self.errors.append(f"{page['name']}: {e}")
+            self.completed += 1
+
+        # Chart samples are known once the chart page data is loaded
+        self.total += len(charts)
+        if charts:
+            from pages.chart.chart import chart_page
+            for label, chart_type, data in charts:
+                self.current = label
+                try:
+                    await chart_page.render_chart(chart_type, data, background=True)
+                except Exception as e:
+                    self.errors.append(f"{label}: {e}")
+                self.completed += 1
+
+        self.current = None
+        self.done = True
+        self.finished_at = time.perf_counter()
+        print(f"Warm-up finished in {self.finished_at - self.started_at:.2f}s "
+              f"({self.completed} items, {len(self.errors)} errors)")
+
+    def warm_page(self, page: Dict[str, Any]) -> List[tuple]:
+        """Import a page module, build its script bundles and render its template
+
+        Runs on a worker thread. Returns the sample charts found in the page
+        data as (label, chart_type, data) tuples.
+        """
+        name = page['name']
+        module = importlib.import_module(page['module'])
+
+        for script_path in self.collect_scripts(name, module):
+            get_script_bundle([script_path])
+
+        page_data = load_page_data(name)
+        if page_data:
+            template_path = os.path.join(_PROJECT_ROOT, 'pages', name, f'{name}_template.html')
+            html = render_template_file(template_path, page_data)
+            put_rendered_page(template_path, page_data, html, name, get_page_data_version(name, page_data))
+
+        return self.collect_charts(page_data or {})
+
+    @staticmethod
+    def collect_scripts(name: str, module: Any) -> List[str]:
+        """Scripts loaded with a page: the patch script, its handler and its page_scripts
+
+        Paths are the ones create_page and the script loader pass to
+        load_script, so the bundles built here are the ones they look up.
+        """
+        scripts = [PATCH_SCRIPT, f'pages/{name}/{name}_handler.js']
+        page_instance = getattr(module, f'{name}_page', None)
+        if page_instance is not None:
+            config = page_instance.get_page_specific_config()
+            scripts.extend(path for _, path in config.get('page_scripts', []))
+        return [path for path in dict.fromkeys(scripts) if os.path.exists(path)]
+
+    @staticmethod
+    def collect_charts(page_data: Dict[str, Any]) -> List[tuple]:
+        """Build chart data for the chart_types samples and quick_charts in page data"""
+        from pages.chart.chart_jobs import parse_chart_input
+
+        entries = []
+        for chart in page_data.get('chart_types', []):
+            sample = chart.get('sample_data', {})
+            entries.append((chart.get('name'), chart.get('value'),
+                            sample.get('x', ''), sample.get('y', ''), chart.get('name')))
+        for chart in page_data.get('quick_charts', []):
+            data = chart.get('data', {})
+            entries.append((chart.get('name'), chart.get('type'),
+                            data.get('x', ''), data.get('y', ''), data.get('title')))
+
+        charts = []
+        for label, chart_type, x_text, y_text, title in entries:
+            try:
+                charts.append((label, chart_type, parse_chart_input(chart_type, x_text, y_text, title)))
+            except ValueError:
+                # Not renderable as typed into the form (e.g. month names on a line chart)
+                continue
+        return charts
+
+    def get_progress(self) -> Dict[str, Any]:
+        """Get warm-up progress"""
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        return {
+            'enabled': self.enabled,
+            'started': self.started,
+            'done': self.done,
+            'total': self.total,
+            'completed': self.completed,
+            'current': self.current,
+            'errors': list(self.errors),
+            'elapsed': elapsed
+        }
+
+
+# Global instance (disable with MYAPP_WARMUP=0)
+warmup_runner = WarmupRunner(enabled=os.environ.get('MYAPP_WARMUP', '1') != '0')
+
+# Convenience functions
+def start_warmup():
+    """Start the background warm-up once"""
+    warmup_runner.start()
+
+def get_warmup_progress():
+    """Get warm-up progress"""
+    return warmup_runner.get_progress()